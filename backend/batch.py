@@ -0,0 +1,200 @@
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from .models import Resume
+from .openai_client import rate_limited
+from . import database as db
+
+# =============================================================================
+# BATCH CONFIGURATION - Override with environment variables
+# =============================================================================
+
+BATCH_MAX_PARALLEL = int(os.environ.get("BATCH_MAX_PARALLEL", "4"))  # Concurrent tailorings per batch
+BATCH_REQUESTS_PER_MINUTE = int(os.environ.get("BATCH_REQUESTS_PER_MINUTE", "60"))  # Across all batches
+BATCH_TOKENS_PER_MINUTE = int(os.environ.get("BATCH_TOKENS_PER_MINUTE", "200000"))  # Across all batches
+BATCH_MAX_JOBS = 100  # Jobs kept for polling
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter for requests per minute and tokens per minute.
+    acquire() waits until both buckets have room. Batch items charge it for
+    every OpenAI completion they make (see openai_client.rate_limited), so
+    fan-out sections, analyses and repairs are all counted.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+        self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+
+    async def acquire(self, tokens: int):
+        # A single request larger than the whole bucket is allowed once the bucket is full
+        tokens = min(tokens, self.tokens_per_minute)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._requests >= 1 and self._tokens >= tokens:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    return
+                wait_requests = (1 - self._requests) * 60 / self.requests_per_minute
+                wait_tokens = (tokens - self._tokens) * 60 / self.tokens_per_minute
+                await asyncio.sleep(max(wait_requests, wait_tokens, 0.01))
+
+
+rate_limiter = RateLimiter(BATCH_REQUESTS_PER_MINUTE, BATCH_TOKENS_PER_MINUTE)
+
+
+class BatchJob:
+    """
+    State of one batch of tailoring requests. Lives in the worker that runs it;
+    every change is published to the database for polling from other workers.
+    """
+
+    def __init__(self, requests: List[Any], prerender: bool):
+        self.id = str(uuid.uuid4())
+        self.requests = requests
+        self.prerender = prerender
+        self.status = "queued"
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self.items: List[Dict[str, Any]] = [
+            {
+                "index": i,
+                "job_title": request.desired_filename_job_title,
+                "status": "pending",
+                "resume_id": None,
+                "error": None,
+                "rendered": [],
+            }
+            for i, request in enumerate(requests)
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for item in self.items:
+            counts[item["status"]] = counts.get(item["status"], 0) + 1
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "counts": counts,
+            "items": self.items,
+        }
+
+
+batch_jobs: "OrderedDict[str, BatchJob]" = OrderedDict()
+
+
+def publish_batch_job(job: BatchJob):
+    """Persist the job's pollable state so every uvicorn worker can answer status requests."""
+    db.save_batch_job_state(job.id, job.to_dict())
+
+
+def create_batch_job(requests: List[Any], prerender: bool = False) -> BatchJob:
+    job = BatchJob(requests, prerender)
+    batch_jobs[job.id] = job
+    db.prune_batch_jobs(BATCH_MAX_JOBS)
+    publish_batch_job(job)
+    # Forget the oldest finished jobs
+    while len(batch_jobs) > BATCH_MAX_JOBS:
+        oldest_id, oldest = next(iter(batch_jobs.items()))
+        if oldest.finished_at is None:
+            break
+        del batch_jobs[oldest_id]
+    return job
+
+
+def get_batch_job_state(job_id: str) -> Optional[Dict[str, Any]]:
+    """Job state from this process if it runs the job, otherwise from the shared database."""
+    job = batch_jobs.get(job_id)
+    if job is not None:
+        return job.to_dict()
+    return db.get_batch_job_state(job_id)
+
+
+async def run_batch_job(
+    job: BatchJob,
+    tailor: Callable[[Any], Awaitable[Resume]],
+    save_all: Callable[[List[Dict[str, Any]]], None],
+    prerender: Optional[Callable[[Resume], Awaitable[List[str]]]] = None,
+    max_parallel: int = BATCH_MAX_PARALLEL,
+):
+    """
+    Tailor every request of the batch with at most max_parallel in flight and
+    within the rate limits, then save all successful resumes in one transaction
+    with save_all(rows) (rows have resume_id, job_title, job_description, job_link, resume).
+    prerender(resume) renders the downloads ahead of time and returns the formats it produced.
+    """
+    job.status = "running"
+    publish_batch_job(job)
+    semaphore = asyncio.Semaphore(max_parallel)
+    results: Dict[int, Resume] = {}
+
+    async def run_item(item: Dict[str, Any], request: Any):
+        async with semaphore:
+            item["status"] = "running"
+            publish_batch_job(job)
+            try:
+                with rate_limited(rate_limiter):
+                    results[item["index"]] = await tailor(request)
+                item["status"] = "generated"
+            except Exception as e:
+                item["status"] = "failed"
+                item["error"] = str(e)
+            publish_batch_job(job)
+
+    await asyncio.gather(*(run_item(item, request) for item, request in zip(job.items, job.requests)))
+
+    rows = []
+    for index, resume in results.items():
+        request = job.requests[index]
+        resume_id = str(uuid.uuid4())
+        job.items[index]["resume_id"] = resume_id
+        rows.append({
+            "resume_id": resume_id,
+            "job_title": request.desired_filename_job_title,
+            "job_description": request.job_description_text,
+            "job_link": request.job_link,
+            "resume": resume,
+        })
+
+    try:
+        if rows:
+            save_all(rows)
+        for index in results:
+            job.items[index]["status"] = "succeeded"
+    except Exception as e:
+        for index in results:
+            job.items[index].update(status="failed", error=f"Save failed: {e}", resume_id=None)
+        results = {}
+
+    if job.prerender and prerender is not None:
+        job.status = "rendering"
+        publish_batch_job(job)
+        for index, resume in results.items():
+            try:
+                job.items[index]["rendered"] = await prerender(resume)
+            except Exception as e:
+                # The resume is saved; only its downloads will be rendered on demand
+                job.items[index]["error"] = f"Pre-render failed: {e}"
+
+    job.status = "completed"
+    job.finished_at = time.time()
+    publish_batch_job(job)
@@ -0,0 +1,136 @@
+"""
+Multi-worker load test for the download endpoints.
+
+Starts `uvicorn backend.main:app --workers N` for each worker count against a
+throwaway database and render cache, seeds distinct resumes, then downloads
+every resume as PDF and Word with many concurrent clients. Each PDF is a cache
+miss (a real render), so throughput shows how rendering scales with cores.
+Each run pins RENDER_POOL_WORKERS so the uvicorn workers share the cores
+instead of each starting one render process per core.
+Every download must succeed whichever worker serves it; the Word download of a
+resume usually lands on a different worker than its PDF.
+
+    python -m backend.benchmarks.load_test --workers 1 2 4 --resumes 200
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def seed_resumes(count: int):
+    """Store `count` distinct copies of the base resume in DATABASE_PATH."""
+    from backend import database as db
+    from backend.main import BASE_USER_RESUME
+
+    db.init_db()
+    rows = []
+    for i in range(count):
+        resume = BASE_USER_RESUME.model_copy(update={"summary": f"{BASE_USER_RESUME.summary} (variant {i})"})
+        rows.append({
+            "resume_id": f"load-{i}",
+            "job_title": f"Load Test {i}",
+            "job_description": "Load test",
+            "job_link": None,
+            "resume_data": resume.model_dump(),
+        })
+    db.save_resumes(rows)
+    db.close_pools()
+
+
+def start_server(workers: int, port: int, env: dict) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--workers", str(workers),
+         "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/cache/resumes/stats", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    process.kill()
+    raise RuntimeError("uvicorn did not start")
+
+
+async def hammer(port: int, resume_ids, concurrency: int):
+    """Download every resume as PDF then Word. Returns (seconds, failures)."""
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = []
+
+    async def download(client: httpx.AsyncClient, resume_id: str):
+        async with semaphore:
+            for fmt in ("pdf", "word"):
+                response = await client.get(f"/download_resume/{fmt}/{resume_id}/Load Test")
+                if response.status_code != 200:
+                    failures.append((resume_id, fmt, response.status_code))
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=120) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(download(client, resume_id) for resume_id in resume_ids))
+        return time.perf_counter() - start, failures
+
+
+def run(worker_counts, resumes: int, concurrency: int):
+    print(f"{'workers':>8} {'renderers':>10} {'requests':>9} {'seconds':>8} {'req/s':>8} {'speedup':>8} {'failed':>7}")
+    baseline = None
+    for workers in worker_counts:
+        render_workers = max((os.cpu_count() or 1) // workers, 1)  # Render processes per uvicorn worker
+        with tempfile.TemporaryDirectory() as scratch:
+            env = dict(
+                os.environ,
+                DATABASE_PATH=os.path.join(scratch, "resumes.db"),
+                LLM_CACHE_PATH=os.path.join(scratch, "llm_cache.db"),
+                RENDER_CACHE_DIR=os.path.join(scratch, "render_cache"),
+                PDF_BACKEND="fpdf",
+                LIBREOFFICE_POOL_SIZE="0",
+                RENDER_POOL_WORKERS=str(render_workers),
+            )
+            # DATABASE_PATH is read at import time, so seed each fresh database in its own process
+            subprocess.run([sys.executable, "-m", "backend.benchmarks.load_test", "--seed", str(resumes)],
+                           env=env, check=True)
+            resume_ids = [f"load-{i}" for i in range(resumes)]
+
+            port = _free_port()
+            server = start_server(workers, port, env)
+            try:
+                seconds, failures = asyncio.run(hammer(port, resume_ids, concurrency))
+            finally:
+                server.terminate()
+                server.wait()
+
+        requests = len(resume_ids) * 2
+        throughput = requests / seconds
+        baseline = baseline or throughput
+        print(f"{workers:>8} {render_workers:>10} {requests:>9} {seconds:>8.2f} {throughput:>8.1f} {throughput / baseline:>7.2f}x {len(failures):>7}")
+        for failure in failures[:5]:
+            print(f"    failed: {failure}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--resumes", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.seed is not None:
+        seed_resumes(args.seed)
+    else:
+        run(args.workers, args.resumes, args.concurrency)
@@ -0,0 +1,50 @@
+"""
+Per-render CPU time of the Word template, cold versus compiled.
+
+"cold" re-reads and re-parses the template and rebuilds the slot map for every
+render (what generate_word_resume used to do); "compiled" fills a copy of the
+template parsed once. Both fill the same resume and serialize the .docx to
+memory (reported separately), so the difference is the cost of loading and
+scanning the template.
+
+    python -m backend.benchmarks.template_benchmark --renders 200
+"""
+import argparse
+import time
+from io import BytesIO
+
+from backend import document_generator as dg
+from backend.main import BASE_USER_RESUME
+
+
+def render_cold(resume):
+    template = dg.CompiledTemplate(dg.TEMPLATE_PATH)
+    document = template.new_document()
+    dg.fill_template(document, template.slots, resume)
+    return document
+
+
+def measure(render, resume, renders: int, save: bool) -> float:
+    """Mean CPU seconds per render, optionally including saving the .docx to memory."""
+    render(resume).save(BytesIO())  # warm up
+    start = time.process_time()
+    for _ in range(renders):
+        document = render(resume)
+        if save:
+            document.save(BytesIO())
+    return (time.process_time() - start) / renders
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--renders", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'':>10} {'fill ms':>9} {'fill+save ms':>13}")
+    results = {}
+    for name, render in (("cold", render_cold), ("compiled", dg.render_template)):
+        results[name] = [measure(render, BASE_USER_RESUME, args.renders, save) for save in (False, True)]
+        fill, total = results[name]
+        print(f"{name:>10} {fill * 1000:>9.2f} {total * 1000:>13.2f}")
+    cold, compiled = results["cold"], results["compiled"]
+    print(f"{'speedup':>10} {cold[0] / compiled[0]:>8.1f}x {cold[1] / compiled[1]:>12.1f}x")
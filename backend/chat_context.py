@@ -0,0 +1,129 @@
+import json
+import os
+from typing import Any, Dict, List, Optional
+from .models import Resume
+from .openai_client import chat_completion
+from .single_flight import SingleFlight
+from . import database as db
+
+# =============================================================================
+# CHAT CONTEXT CONFIGURATION - Override with environment variables
+# =============================================================================
+
+CHAT_MODEL = "gpt-4o-mini"
+CHAT_CONTEXT_TOKENS = int(os.environ.get("CHAT_CONTEXT_TOKENS", "8000"))  # Prompt budget: system + history + new message
+CHAT_RECENT_MESSAGES = int(os.environ.get("CHAT_RECENT_MESSAGES", "6"))  # Newest messages never folded into the summary
+CHAT_SUMMARY_TRIGGER_TOKENS = int(os.environ.get("CHAT_SUMMARY_TRIGGER_TOKENS", "3000"))  # Fold older turns past this much history
+CHAT_SUMMARY_MAX_TOKENS = 400  # Length of the rolling summary
+CHAT_MAX_LOADED_MESSAGES = 100  # Uncovered messages read per turn
+MESSAGE_OVERHEAD_TOKENS = 4  # Role and separators of one chat message
+
+
+def count_tokens(text: str) -> int:
+    """
+    Estimate the tokens of text at about 4 characters per token, like the rate
+    limiter does. Only used for budgets, which leave ample room below the
+    model's context window, so an exact tokenizer is not needed.
+    """
+    return len(text) // 4 + 1
+
+
+def message_tokens(message: Dict[str, Any]) -> int:
+    return count_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+
+
+def compact_resume(resume: Resume) -> str:
+    """Resume as minified JSON, without empty fields."""
+    return json.dumps(resume.model_dump(exclude_none=True), separators=(",", ":"), ensure_ascii=False)
+
+
+def build_system_message(resume: Resume, summary: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    content = (
+        "You are a helpful assistant that answers questions about the following resume. "
+        "Be specific and reference actual content from the resume when answering.\n\n"
+        f"RESUME DATA (JSON):\n{compact_resume(resume)}"
+    )
+    if summary:
+        content += f"\n\nSUMMARY OF THE EARLIER CONVERSATION:\n{summary['summary']}"
+    return {"role": "system", "content": content}
+
+
+def build_chat_messages(resume_id: str, resume: Resume, message: str) -> List[Dict[str, str]]:
+    """
+    Prompt for the next chat turn within CHAT_CONTEXT_TOKENS: the resume, the
+    rolling summary of older turns and as many of the newest messages as fit,
+    verbatim. Turns not yet folded into the summary that don't fit are left out.
+    """
+    summary, history = db.get_chat_context(resume_id, CHAT_MAX_LOADED_MESSAGES)
+    system = build_system_message(resume, summary)
+    current = {"role": "user", "content": message}
+    budget = CHAT_CONTEXT_TOKENS - message_tokens(system) - message_tokens(current)
+
+    kept = []
+    for past in reversed(history):
+        cost = message_tokens(past)
+        if cost > budget:
+            break
+        budget -= cost
+        kept.append({"role": past["role"], "content": past["content"]})
+    kept.reverse()
+    return [system] + kept + [current]
+
+
+def build_summary_messages(summary: Optional[Dict[str, Any]], messages: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    transcript = "\n".join(f"{message['role']}: {message['content']}" for message in messages)
+    previous = summary["summary"] if summary else "(none)"
+    prompt = f"""
+    Update the running summary of a conversation about a resume with the new messages below.
+    Keep the user's questions, requests, preferences and any decisions or facts given in the answers.
+    Write at most {CHAT_SUMMARY_MAX_TOKENS // 2} words of plain text.
+
+    Current summary:\n{previous}
+
+    New messages:\n{transcript}
+    """
+    return [
+        {"role": "system", "content": "You summarize conversations concisely and accurately."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+async def compact_chat_history(resume_id: str) -> bool:
+    """
+    Fold all but the CHAT_RECENT_MESSAGES newest uncovered messages into the
+    rolling summary once they exceed CHAT_SUMMARY_TRIGGER_TOKENS, oldest first
+    and CHAT_MAX_LOADED_MESSAGES at a time, so a long backlog (e.g. a migrated
+    chat) is summarized rather than skipped. Returns whether the summary was updated.
+    """
+    _, history = db.get_chat_context(resume_id, CHAT_MAX_LOADED_MESSAGES)
+    older = history[:-CHAT_RECENT_MESSAGES] if CHAT_RECENT_MESSAGES else history
+    if not older or sum(message_tokens(message) for message in history) <= CHAT_SUMMARY_TRIGGER_TOKENS:
+        return False
+
+    while True:
+        summary, older = db.get_chat_messages_to_fold(resume_id, CHAT_RECENT_MESSAGES, CHAT_MAX_LOADED_MESSAGES)
+        if not older:
+            return True
+        response = await chat_completion(
+            model=CHAT_MODEL,
+            messages=build_summary_messages(summary, older),
+            max_tokens=CHAT_SUMMARY_MAX_TOKENS
+        )
+        # Saved per chunk, so progress survives a failed call
+        db.save_chat_summary(resume_id, response.choices[0].message.content, older[-1]["seq"])
+        if len(older) < CHAT_MAX_LOADED_MESSAGES:
+            return True
+
+
+# Summaries being written, keyed by resume_id
+compaction_flight = SingleFlight()
+
+
+def schedule_chat_compaction(resume_id: str):
+    """Update the rolling summary in the background after a turn, off the response path."""
+    compaction_flight.start(resume_id, lambda: compact_chat_history(resume_id)).add_done_callback(_report_compaction)
+
+
+def _report_compaction(job):
+    if not job.cancelled() and job.exception() is not None:
+        print(f"Chat summary failed: {job.exception()}")
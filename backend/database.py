@@ -1,151 +1,794 @@
 import sqlite3
+import base64
+import hashlib
+import html
 import json
 import os
+import queue
+import threading
+import zlib
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any, Tuple
+from .metrics import timed
 
-DATABASE_PATH = "./data/resumes.db"
+DATABASE_PATH = os.environ.get("DATABASE_PATH", "./data/resumes.db")
+
+# =============================================================================
+# CONNECTION POOL CONFIGURATION - Override with environment variables
+# =============================================================================
+
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "8"))  # Connections kept open per process
+DB_POOL_TIMEOUT = 30  # Seconds to wait for a free connection
+DB_BUSY_TIMEOUT_MS = 5000  # How long a writer waits on a locked database
+DB_CACHE_SIZE_KB = 16384  # Page cache per connection
+DB_STATEMENT_CACHE = 128  # Compiled statements kept per connection
+DB_MMAP_SIZE = int(os.environ.get("DB_MMAP_SIZE", str(256 * 1024 * 1024)))  # Memory-mapped reads, shared page cache across workers
+BLOB_COMPRESSION_LEVEL = 6  # zlib level for stored job descriptions and resume JSON
+
+def compress_text(text: str) -> Tuple[str, bytes]:
+    """(sha256 hex of the text, zlib-compressed text) for the blobs table."""
+    raw = text.encode("utf-8")
+    return hashlib.sha256(raw).hexdigest(), zlib.compress(raw, BLOB_COMPRESSION_LEVEL)
+
+def resume_data_version(resume_data: dict) -> str:
+    """The resume_data_hash that storing resume_data gives; what get_resume_version() returns."""
+    return hashlib.sha256(compact_json(resume_data).encode("utf-8")).hexdigest()
+
+def inflate_text(data: Optional[bytes]) -> Optional[str]:
+    """Decompress a blob; also registered as the SQL function inflate_text() on every connection."""
+    return zlib.decompress(data).decode("utf-8") if data is not None else None
+
+def inflate_prefix(data: Optional[bytes], chars: int) -> Optional[str]:
+    """First characters of a compressed text, decompressing only as much as needed."""
+    if data is None:
+        return None
+    raw = zlib.decompressobj().decompress(data, chars * 4)  # At most 4 UTF-8 bytes per character
+    return raw.decode("utf-8", errors="ignore")[:chars]
+
+def compact_json(data: Any) -> str:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+def resume_search_text(resume_json: Optional[str], part: str) -> Optional[str]:
+    """
+    Text of one part of a resume for the search index: "summary", "skills" (all
+    skill lines) or "bullets" (every experience description). Registered as the
+    SQL function resume_search_text(); FTS5 can't read its content from a view
+    that uses json_each.
+    """
+    if resume_json is None:
+        return None
+    data = json.loads(resume_json)
+    if part == "summary":
+        return data.get("summary")
+    if part == "skills":
+        return " ".join(data.get("skills") or [])
+    return " ".join(entry.get("description") or "" for entry in data.get("experience") or [])
+
+class ConnectionPool:
+    """
+    Thread-safe pool of SQLite connections in WAL mode, so readers never block
+    the writer. Connections run in autocommit mode; writes go through
+    transaction(). Each connection keeps its compiled statements, so reusing
+    the module-level SQL strings below skips re-preparing them.
+    """
+
+    def __init__(self, path: str, size: int = DB_POOL_SIZE):
+        self.path = path
+        self.size = size
+        self.pid = os.getpid()
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=DB_STATEMENT_CACHE,
+        )
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')  # Safe with WAL, avoids an fsync per commit
+        conn.execute(f'PRAGMA cache_size=-{DB_CACHE_SIZE_KB}')
+        conn.execute(f'PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute(f'PRAGMA mmap_size={DB_MMAP_SIZE}')
+        conn.execute('PRAGMA foreign_keys=ON')  # Chat messages and summaries are deleted with their resume
+        # Stored text is compressed; the search index reads it (snippets, rebuilds) decompressed and split in SQL
+        conn.create_function('inflate_text', 1, inflate_text, deterministic=True)
+        conn.create_function('resume_search_text', 2, resume_search_text, deterministic=True)
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                try:
+                    return self._connect()
+                except Exception:
+                    self._created -= 1
+                    raise
+        try:
+            return self._idle.get(timeout=DB_POOL_TIMEOUT)
+        except queue.Empty:
+            raise TimeoutError(f"No database connection available for {self.path}")
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection for reads (autocommit)."""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection inside BEGIN IMMEDIATE ... COMMIT, rolled back on error."""
+        with self.connection() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        self._created = 0
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+def get_pool(path: Optional[str] = None) -> ConnectionPool:
+    """
+    Connection pool for a database file (DATABASE_PATH by default), recreated
+    after a fork (e.g. uvicorn --workers) so processes never share connections.
+    """
+    path = path or DATABASE_PATH
+    with _pools_lock:
+        pool = _pools.get(path)
+        if pool is None or pool.pid != os.getpid():
+            pool = _pools[path] = ConnectionPool(path)
+        return pool
+
+def close_pools():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+def connection():
+    return get_pool().connection()
+
+def transaction():
+    return get_pool().transaction()
+
+# --- SQL statements (kept as constants so each connection reuses the prepared statement) ---
+
+# An upsert rather than INSERT OR REPLACE: replacing deletes the row, which would cascade to its chat
+SQL_SAVE_RESUME = '''
+    INSERT INTO resumes (id, job_title, job_description_hash, job_link, resume_data_hash, name, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        job_title = excluded.job_title, job_description_hash = excluded.job_description_hash, job_link = excluded.job_link,
+        resume_data_hash = excluded.resume_data_hash, name = excluded.name, created_at = excluded.created_at
+'''
+# Job descriptions and resume JSON live zlib-compressed in blobs, stored once per distinct content
+SQL_SAVE_BLOB = 'INSERT OR IGNORE INTO blobs (hash, data, size) VALUES (?, ?, ?)'
+SQL_GET_BLOB_HASHES = 'SELECT job_description_hash, resume_data_hash FROM resumes WHERE id = ?'
+SQL_DELETE_UNUSED_BLOB = '''
+    DELETE FROM blobs WHERE hash = ?
+    AND NOT EXISTS (SELECT 1 FROM resumes WHERE job_description_hash = blobs.hash)
+    AND NOT EXISTS (SELECT 1 FROM resumes WHERE resume_data_hash = blobs.hash)
+'''
+SQL_GET_RESUME = '''
+    SELECT r.id, r.job_title, jd.data, r.job_link, rd.data, r.created_at
+    FROM resumes r
+    LEFT JOIN blobs jd ON jd.hash = r.job_description_hash
+    JOIN blobs rd ON rd.hash = r.resume_data_hash
+    WHERE r.id = ?
+'''
+SQL_GET_RESUME_VERSION = 'SELECT resume_data_hash FROM resumes WHERE id = ?'
+SQL_UPDATE_RESUME_DATA = 'UPDATE resumes SET resume_data_hash = ?, name = ? WHERE id = ?'
+# History pages only read the job description blob when a preview is asked for; the (created_at, id) index serves both queries
+SQL_GET_RESUMES_FIRST_PAGE = '''
+    SELECT r.id, r.job_title, r.job_link, r.created_at, r.name, jd.data
+    FROM resumes r
+    LEFT JOIN blobs jd ON ? > 0 AND jd.hash = r.job_description_hash
+    ORDER BY r.created_at DESC, r.id DESC
+    LIMIT ?
+'''
+SQL_GET_RESUMES_PAGE = '''
+    SELECT r.id, r.job_title, r.job_link, r.created_at, r.name, jd.data
+    FROM resumes r
+    LEFT JOIN blobs jd ON ? > 0 AND jd.hash = r.job_description_hash
+    WHERE (r.created_at, r.id) < (?, ?)
+    ORDER BY r.created_at DESC, r.id DESC
+    LIMIT ?
+'''
+SQL_SEARCH_RESUMES = '''
+    SELECT r.id, r.job_title, r.job_link, r.created_at, r.name,
+           snippet(resumes_fts, -1, ?, ?, '…', ?) AS snippet,
+           bm25(resumes_fts, 5.0, 1.0, 2.0, 2.0, 1.0) AS rank
+    FROM resumes_fts
+    JOIN resumes r ON r.rowid = resumes_fts.rowid
+    WHERE resumes_fts MATCH ?
+    ORDER BY rank
+    LIMIT ? OFFSET ?
+'''
+SQL_DELETE_RESUME = 'DELETE FROM resumes WHERE id = ?'
+# The search index is kept in sync from Python, so plain SQLite tools can still write to resumes
+SQL_GET_SEARCH_SOURCE = '''
+    SELECT r.rowid, r.job_title, jd.data, rd.data
+    FROM resumes r
+    LEFT JOIN blobs jd ON jd.hash = r.job_description_hash
+    JOIN blobs rd ON rd.hash = r.resume_data_hash
+    WHERE r.id = ?
+'''
+SQL_INDEX_RESUME = 'INSERT INTO resumes_fts (rowid, job_title, job_description, summary, skills, bullets) VALUES (?, ?, ?, ?, ?, ?)'
+# External-content rows are removed by handing the index the values they were indexed with
+SQL_UNINDEX_RESUME = '''
+    INSERT INTO resumes_fts (resumes_fts, rowid, job_title, job_description, summary, skills, bullets)
+    VALUES ('delete', ?, ?, ?, ?, ?, ?)
+'''
+SQL_COUNT_UNINDEXED = 'SELECT (SELECT COUNT(*) FROM resumes) != (SELECT COUNT(*) FROM resumes_fts_docsize)'
+# Chat reads and appends all go through the (resume_id, seq) unique index
+SQL_RESERVE_CHAT_SEQ = 'UPDATE resumes SET chat_seq = chat_seq + ? WHERE id = ? RETURNING chat_seq'
+SQL_SAVE_CHAT_MESSAGE = '''
+    INSERT INTO chat_history (resume_id, seq, role, content)
+    VALUES (?, ?, ?, ?)
+'''
+SQL_GET_CHAT_HISTORY = '''
+    SELECT seq, role, content, created_at FROM chat_history
+    WHERE resume_id = ?
+    ORDER BY seq ASC
+'''
+SQL_GET_CHAT_FIRST_PAGE = '''
+    SELECT seq, role, content, created_at FROM chat_history
+    WHERE resume_id = ?
+    ORDER BY seq DESC
+    LIMIT ?
+'''
+SQL_GET_CHAT_PAGE = '''
+    SELECT seq, role, content, created_at FROM chat_history
+    WHERE resume_id = ? AND seq < ?
+    ORDER BY seq DESC
+    LIMIT ?
+'''
+SQL_CLEAR_CHAT_HISTORY = 'DELETE FROM chat_history WHERE resume_id = ?'
+SQL_GET_RECENT_CHAT_MESSAGES = '''
+    SELECT seq, role, content FROM chat_history
+    WHERE resume_id = ? AND seq > ?
+    ORDER BY seq DESC
+    LIMIT ?
+'''
+# The oldest messages the summary doesn't cover yet, up to the newest one before the `keep` most recent (OFFSET ?)
+SQL_GET_CHAT_MESSAGES_TO_FOLD = '''
+    SELECT seq, role, content FROM chat_history
+    WHERE resume_id = ? AND seq > ?
+    AND seq <= (SELECT seq FROM chat_history WHERE resume_id = ? ORDER BY seq DESC LIMIT 1 OFFSET ?)
+    ORDER BY seq ASC
+    LIMIT ?
+'''
+SQL_GET_CHAT_SUMMARY = 'SELECT summary, covered_seq FROM chat_summaries WHERE resume_id = ?'
+# Only while the covered message still exists: a summary finished after its chat was cleared is dropped
+SQL_SAVE_CHAT_SUMMARY = '''
+    INSERT INTO chat_summaries (resume_id, summary, covered_seq, updated_at)
+    SELECT ?, ?, ?, ?
+    WHERE EXISTS (SELECT 1 FROM chat_history WHERE resume_id = ? AND seq = ?)
+    ON CONFLICT(resume_id) DO UPDATE SET
+        summary = excluded.summary, covered_seq = excluded.covered_seq, updated_at = excluded.updated_at
+    WHERE excluded.covered_seq > chat_summaries.covered_seq
+'''
+SQL_CLEAR_CHAT_SUMMARY = 'DELETE FROM chat_summaries WHERE resume_id = ?'
+SQL_SAVE_BATCH_JOB = 'INSERT OR REPLACE INTO batch_jobs (id, state, updated_at) VALUES (?, ?, ?)'
+SQL_GET_BATCH_JOB = 'SELECT state FROM batch_jobs WHERE id = ?'
+# Jobs still queued, running or rendering (in any worker) are never pruned
+SQL_PRUNE_BATCH_JOBS = '''
+    DELETE FROM batch_jobs
+    WHERE json_extract(state, '$.status') = 'completed'
+    AND id NOT IN (SELECT id FROM batch_jobs ORDER BY updated_at DESC LIMIT ?)
+'''
+
+# Values indexed for one resume: job title and description, summary, skill lines and every
+# experience description. {source} yields resume_rowid, job_title, job_description and resume_json.
+FTS_VALUES = '''
+    SELECT resume_rowid, job_title, job_description,
+           resume_search_text(resume_json, 'summary'),
+           resume_search_text(resume_json, 'skills'),
+           resume_search_text(resume_json, 'bullets')
+    FROM ({source})
+'''
+# Decompressed text of every resume, the content table of the search index (snippets, rebuilds)
+FTS_VIEW_SOURCE = '''
+    SELECT r.rowid AS resume_rowid, r.job_title AS job_title,
+           inflate_text(jd.data) AS job_description, inflate_text(rd.data) AS resume_json
+    FROM resumes r
+    LEFT JOIN blobs jd ON jd.hash = r.job_description_hash
+    JOIN blobs rd ON rd.hash = r.resume_data_hash
+'''
+FTS_COLUMNS = 'job_title, job_description, summary, skills, bullets'
 
 def init_db():
     """Initialize the database and create tables if they don't exist."""
     os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
-    
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    # Create resumes table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS resumes (
-            id TEXT PRIMARY KEY,
-            job_title TEXT NOT NULL,
-            job_description TEXT,
-            job_link TEXT,
-            resume_data TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Migration: Add job_link column if it doesn't exist (for existing databases)
-    cursor.execute("PRAGMA table_info(resumes)")
-    columns = [col[1] for col in cursor.fetchall()]
-    if 'job_link' not in columns:
-        cursor.execute('ALTER TABLE resumes ADD COLUMN job_link TEXT')
-    
-    # Create chat_history table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS chat_history (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            resume_id TEXT NOT NULL,
-            role TEXT NOT NULL,
-            content TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (resume_id) REFERENCES resumes(id)
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+
+    with transaction() as conn:
+        # Compressed, content-addressed text shared by all resumes (hash = sha256 of the text)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS blobs (
+                hash TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL
+            )
+        ''')
+
+        # Create resumes table
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS resumes (
+                id TEXT PRIMARY KEY,
+                job_title TEXT NOT NULL,
+                job_description_hash TEXT,
+                job_link TEXT,
+                resume_data_hash TEXT NOT NULL,
+                name TEXT,
+                chat_seq INTEGER NOT NULL DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # Migration: Add job_link column if it doesn't exist (for existing databases)
+        columns = [col[1] for col in conn.execute("PRAGMA table_info(resumes)").fetchall()]
+        if 'job_link' not in columns:
+            conn.execute('ALTER TABLE resumes ADD COLUMN job_link TEXT')
+
+        # Migration: Denormalized name column for history listings (backfilled from resume_data)
+        if 'name' not in columns:
+            conn.execute('ALTER TABLE resumes ADD COLUMN name TEXT')
+            conn.execute("UPDATE resumes SET name = json_extract(resume_data, '$.name')")
+
+        # Migration: move job descriptions and resume JSON out of the rows into compressed blobs
+        migrated_to_blobs = 'resume_data' in columns
+        if migrated_to_blobs:
+            migrate_resumes_to_blobs(conn)
+
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_resumes_created_at ON resumes(created_at DESC, id DESC)')
+        # Let blob garbage collection check for remaining references without a scan
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_resumes_job_description_hash ON resumes(job_description_hash)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_resumes_resume_data_hash ON resumes(resume_data_hash)')
+
+        # Full-text search index over job title, job description and generated content.
+        # An external-content index: it stores only the index and reads the (decompressed)
+        # text from the resumes_search view. Rows share rowids with resumes and are kept
+        # in sync by the save/update/delete functions below, not by triggers, so other
+        # SQLite tools can still write to resumes (their changes are indexed on the next rebuild).
+        fts_exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'resumes_fts'").fetchone()
+        conn.execute(f'''
+            CREATE VIEW IF NOT EXISTS resumes_search (resume_rowid, {FTS_COLUMNS}) AS
+            {FTS_VALUES.format(source=FTS_VIEW_SOURCE)}
+        ''')
+        conn.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS resumes_fts USING fts5(
+                {FTS_COLUMNS},
+                content = 'resumes_search', content_rowid = 'resume_rowid',
+                tokenize = 'porter unicode61'
+            )
+        ''')
+        if not fts_exists or conn.execute(SQL_COUNT_UNINDEXED).fetchone()[0]:
+            # Migration: index resumes saved before search existed, or added / deleted by other tools
+            conn.execute("INSERT INTO resumes_fts (resumes_fts) VALUES ('rebuild')")
+
+        # Batch tailoring job state, shared by all uvicorn workers
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS batch_jobs (
+                id TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                updated_at TIMESTAMP
+            )
+        ''')
+
+        # Migration: the foreign key cascade and seq can't be added to an existing chat_history
+        # in place, so an older table is renamed, recreated below and copied over
+        chat_columns = [col[1] for col in conn.execute("PRAGMA table_info(chat_history)").fetchall()]
+        rebuild_chat = bool(chat_columns) and 'seq' not in chat_columns
+        if rebuild_chat:
+            conn.execute('ALTER TABLE chat_history RENAME TO chat_history_old')
+
+        # Create chat_history table. seq numbers each resume's messages 1, 2, 3, ...
+        # so ordering never depends on second-granularity timestamps
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS chat_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                resume_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (resume_id) REFERENCES resumes(id) ON DELETE CASCADE,
+                UNIQUE (resume_id, seq)
+            )
+        ''')
+        if rebuild_chat:
+            # Messages of deleted resumes can't satisfy the foreign key and are dropped
+            conn.execute('''
+                INSERT INTO chat_history (id, resume_id, seq, role, content, created_at)
+                SELECT id, resume_id, ROW_NUMBER() OVER (PARTITION BY resume_id ORDER BY created_at, id),
+                       role, content, created_at
+                FROM chat_history_old
+                WHERE resume_id IN (SELECT id FROM resumes)
+            ''')
+            conn.execute('DROP TABLE chat_history_old')
+
+        # Migration: last chat seq handed out per resume. Kept when a chat is cleared, so seq
+        # numbers are never reused (a summary of the cleared chat can't cover new messages)
+        if 'chat_seq' not in columns:
+            conn.execute('ALTER TABLE resumes ADD COLUMN chat_seq INTEGER NOT NULL DEFAULT 0')
+            conn.execute('UPDATE resumes SET chat_seq = (SELECT COALESCE(MAX(seq), 0) FROM chat_history WHERE resume_id = resumes.id)')
+
+        # Rolling summary of the chat messages up to covered_seq (older turns folded out of the prompt)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS chat_summaries (
+                resume_id TEXT PRIMARY KEY,
+                summary TEXT NOT NULL,
+                covered_seq INTEGER NOT NULL,
+                updated_at TIMESTAMP,
+                FOREIGN KEY (resume_id) REFERENCES resumes(id) ON DELETE CASCADE
+            )
+        ''')
+
+    if migrated_to_blobs:
+        # Give the space of the moved text back to the file system
+        with connection() as conn:
+            conn.execute('VACUUM')
+
+def migrate_resumes_to_blobs(conn: sqlite3.Connection, batch_size: int = 500):
+    """
+    Move job_description and resume_data (as compact JSON) of every row into
+    blobs and drop the old columns.
+    """
+    conn.execute('ALTER TABLE resumes ADD COLUMN job_description_hash TEXT')
+    conn.execute("ALTER TABLE resumes ADD COLUMN resume_data_hash TEXT NOT NULL DEFAULT ''")
+
+    last_rowid = 0
+    while True:
+        rows = conn.execute(
+            'SELECT rowid, job_description, resume_data FROM resumes WHERE rowid > ? ORDER BY rowid LIMIT ?',
+            (last_rowid, batch_size)
+        ).fetchall()
+        if not rows:
+            break
+        updates = []
+        for rowid, job_description, resume_data in rows:
+            job_description_hash = _save_blob(conn, job_description) if job_description is not None else None
+            resume_data_hash = _save_blob(conn, compact_json(json.loads(resume_data)))
+            updates.append((job_description_hash, resume_data_hash, rowid))
+        conn.executemany('UPDATE resumes SET job_description_hash = ?, resume_data_hash = ? WHERE rowid = ?', updates)
+        last_rowid = rows[-1][0]
+
+    conn.execute('ALTER TABLE resumes DROP COLUMN job_description')
+    conn.execute('ALTER TABLE resumes DROP COLUMN resume_data')
+
+def _save_blob(conn: sqlite3.Connection, text: str) -> str:
+    """Store text in blobs (once per distinct content) and return its hash."""
+    blob_hash, data = compress_text(text)
+    conn.execute(SQL_SAVE_BLOB, (blob_hash, data, len(text)))
+    return blob_hash
+
+def _delete_unused_blobs(conn: sqlite3.Connection, hashes: List[Optional[str]]):
+    """Delete the given blobs that no resume references any more."""
+    conn.executemany(SQL_DELETE_UNUSED_BLOB, [(blob_hash,) for blob_hash in set(hashes) if blob_hash])
+
+def _replaced_blob_hashes(conn: sqlite3.Connection, resume_ids: List[str]) -> List[Optional[str]]:
+    hashes = []
+    for resume_id in resume_ids:
+        row = conn.execute(SQL_GET_BLOB_HASHES, (resume_id,)).fetchone()
+        if row:
+            hashes.extend(row)
+    return hashes
+
+def _search_entries(conn: sqlite3.Connection, resume_ids: List[str]) -> List[Tuple[Any, ...]]:
+    """Values the search index holds for these resumes (rowid first), from their stored text."""
+    entries = []
+    for resume_id in resume_ids:
+        row = conn.execute(SQL_GET_SEARCH_SOURCE, (resume_id,)).fetchone()
+        if row:
+            resume_json = inflate_text(row[3])
+            entries.append((row[0], row[1], inflate_text(row[2]), *(
+                resume_search_text(resume_json, part) for part in ("summary", "skills", "bullets")
+            )))
+    return entries
+
+@timed("db")
+def save_batch_job_state(job_id: str, state: Dict[str, Any]):
+    """Store the pollable state of a batch job so any worker can serve it."""
+    with transaction() as conn:
+        conn.execute(SQL_SAVE_BATCH_JOB, (job_id, json.dumps(state), datetime.now()))
+
+@timed("db")
+def get_batch_job_state(job_id: str) -> Optional[Dict[str, Any]]:
+    with connection() as conn:
+        row = conn.execute(SQL_GET_BATCH_JOB, (job_id,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+@timed("db")
+def prune_batch_jobs(keep: int):
+    """Forget completed batch jobs that are not among the `keep` most recently updated ones."""
+    with transaction() as conn:
+        conn.execute(SQL_PRUNE_BATCH_JOBS, (keep,))
 
 def save_resume(resume_id: str, job_title: str, job_description: str, resume_data: dict, job_link: str = None):
     """Save a generated resume to the database."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        INSERT OR REPLACE INTO resumes (id, job_title, job_description, job_link, resume_data, created_at)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (resume_id, job_title, job_description, job_link, json.dumps(resume_data), datetime.now()))
-    
-    conn.commit()
-    conn.close()
+    save_resumes([{
+        "resume_id": resume_id,
+        "job_title": job_title,
+        "job_description": job_description,
+        "resume_data": resume_data,
+        "job_link": job_link,
+    }])
+
+@timed("db")
+def update_resume_data(resume_id: str, resume_data: dict) -> bool:
+    """Replace the stored resume content, keeping its job, link and creation time. Returns False if it doesn't exist."""
+    with transaction() as conn:
+        replaced = _replaced_blob_hashes(conn, [resume_id])
+        conn.executemany(SQL_UNINDEX_RESUME, _search_entries(conn, [resume_id]))
+        resume_data_hash = _save_blob(conn, compact_json(resume_data))
+        cursor = conn.execute(SQL_UPDATE_RESUME_DATA, (resume_data_hash, resume_data.get("name"), resume_id))
+        conn.executemany(SQL_INDEX_RESUME, _search_entries(conn, [resume_id]))
+        _delete_unused_blobs(conn, replaced)
+        return cursor.rowcount > 0
 
+@timed("db")
+def save_resumes(resumes: List[Dict[str, Any]]):
+    """
+    Save several generated resumes in a single transaction.
+    Each item has the keyword arguments of save_resume.
+    """
+    now = datetime.now()
+    resume_ids = [r["resume_id"] for r in resumes]
+    with transaction() as conn:
+        replaced = _replaced_blob_hashes(conn, resume_ids)
+        conn.executemany(SQL_UNINDEX_RESUME, _search_entries(conn, resume_ids))
+        conn.executemany(SQL_SAVE_RESUME, [
+            (
+                r["resume_id"], r["job_title"],
+                _save_blob(conn, r["job_description"]) if r["job_description"] is not None else None,
+                r.get("job_link"), _save_blob(conn, compact_json(r["resume_data"])), r["resume_data"].get("name"), now
+            )
+            for r in resumes
+        ])
+        conn.executemany(SQL_INDEX_RESUME, _search_entries(conn, resume_ids))
+        _delete_unused_blobs(conn, replaced)
+
+@timed("db")
+def get_resume_version(resume_id: str) -> Optional[str]:
+    """Hash of the stored resume content (changes with every update), or None if it doesn't exist."""
+    with connection() as conn:
+        row = conn.execute(SQL_GET_RESUME_VERSION, (resume_id,)).fetchone()
+    return row[0] if row else None
+
+@timed("db")
 def get_resume(resume_id: str) -> Optional[Dict[str, Any]]:
     """Retrieve a resume by ID."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('SELECT id, job_title, job_description, job_link, resume_data, created_at FROM resumes WHERE id = ?', (resume_id,))
-    row = cursor.fetchone()
-    conn.close()
-    
+    with connection() as conn:
+        row = conn.execute(SQL_GET_RESUME, (resume_id,)).fetchone()
+
     if row:
         return {
             "id": row[0],
             "job_title": row[1],
-            "job_description": row[2],
+            "job_description": inflate_text(row[2]),
             "job_link": row[3],
-            "resume_data": json.loads(row[4]),
+            "resume_data": json.loads(inflate_text(row[4])),
             "created_at": row[5]
         }
     return None
 
-def get_all_resumes() -> List[Dict[str, Any]]:
-    """Get all resumes (summary only, without full data for performance)."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT id, job_title, job_description, job_link, created_at, resume_data 
-        FROM resumes 
-        ORDER BY created_at DESC
-    ''')
-    rows = cursor.fetchall()
-    conn.close()
-    
-    resumes = []
-    for row in rows:
-        resume_data = json.loads(row[5])
-        resumes.append({
+def encode_history_cursor(created_at: str, resume_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{created_at}|{resume_id}".encode("utf-8")).decode("ascii")
+
+def decode_history_cursor(cursor: str) -> Tuple[str, str]:
+    """Raises ValueError for a malformed cursor."""
+    try:
+        created_at, resume_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|", 1)
+    except Exception:
+        raise ValueError("Invalid history cursor")
+    return created_at, resume_id
+
+@timed("db")
+def get_resumes_page(limit: int = 20, cursor: Optional[str] = None, preview_chars: int = 0) -> Dict[str, Any]:
+    """
+    Get one page of history, newest first, using keyset pagination.
+    Pass the returned next_cursor to get the following page (None when there are no more).
+    preview_chars > 0 adds the first characters of the job description as job_description_preview.
+    """
+    with connection() as conn:
+        if cursor:
+            created_at, resume_id = decode_history_cursor(cursor)
+            rows = conn.execute(SQL_GET_RESUMES_PAGE, (preview_chars, created_at, resume_id, limit + 1)).fetchall()
+        else:
+            rows = conn.execute(SQL_GET_RESUMES_FIRST_PAGE, (preview_chars, limit + 1)).fetchall()
+
+    items = []
+    for row in rows[:limit]:
+        item = {
             "id": row[0],
             "job_title": row[1],
-            "job_description": row[2],
-            "job_link": row[3],
-            "created_at": row[4],
-            "name": resume_data.get("name", "Unknown")
-        })
-    return resumes
+            "job_link": row[2],
+            "created_at": row[3],
+            "name": row[4] or "Unknown"
+        }
+        if preview_chars > 0:
+            item["job_description_preview"] = inflate_prefix(row[5], preview_chars)
+        items.append(item)
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_history_cursor(last[3], last[0])
+    return {"items": items, "next_cursor": next_cursor}
+
+# Control characters never found in indexed text; replaced by the highlight markers after escaping
+SNIPPET_MARKERS = ('\x02', '\x03')
 
+def _highlight(snippet: Optional[str], highlight: Tuple[str, str]) -> Optional[str]:
+    """Escape the stored text of a snippet for HTML, then insert the highlight markers."""
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(SNIPPET_MARKERS[0], highlight[0]).replace(SNIPPET_MARKERS[1], highlight[1])
+
+def build_search_query(text: str) -> str:
+    """
+    Turn free text into a safe FTS5 query: every word must match (quoted, so
+    FTS syntax characters are literal) and the last word also matches as a prefix.
+    """
+    terms = ['"' + term.replace('"', '""') + '"' for term in text.split()]
+    if terms:
+        terms[-1] += '*'
+    return ' '.join(terms)
+
+@timed("db")
+def search_resumes(text: str, limit: int = 20, offset: int = 0, highlight: Tuple[str, str] = ('<mark>', '</mark>'),
+                   snippet_tokens: int = 16) -> Dict[str, Any]:
+    """
+    Full-text search over history, best matches first (job title weighted highest).
+    Each item carries an HTML-escaped snippet with matches wrapped in the highlight markers.
+    Returns {"items": [...], "next_offset": int or None}.
+    """
+    query = build_search_query(text)
+    if not query:
+        return {"items": [], "next_offset": None}
+
+    with connection() as conn:
+        rows = conn.execute(SQL_SEARCH_RESUMES, (*SNIPPET_MARKERS, snippet_tokens, query, limit + 1, offset)).fetchall()
+
+    items = [
+        {
+            "id": row[0],
+            "job_title": row[1],
+            "job_link": row[2],
+            "created_at": row[3],
+            "name": row[4] or "Unknown",
+            "snippet": _highlight(row[5], highlight),
+            "rank": row[6]
+        }
+        for row in rows[:limit]
+    ]
+    return {"items": items, "next_offset": offset + limit if len(rows) > limit else None}
+
+@timed("db")
 def delete_resume(resume_id: str) -> bool:
-    """Delete a resume and its chat history."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('DELETE FROM chat_history WHERE resume_id = ?', (resume_id,))
-    cursor.execute('DELETE FROM resumes WHERE id = ?', (resume_id,))
-    
-    deleted = cursor.rowcount > 0
-    conn.commit()
-    conn.close()
+    """Delete a resume; its chat history and summary are deleted with it (ON DELETE CASCADE)."""
+    with transaction() as conn:
+        replaced = _replaced_blob_hashes(conn, [resume_id])
+        conn.executemany(SQL_UNINDEX_RESUME, _search_entries(conn, [resume_id]))
+        deleted = conn.execute(SQL_DELETE_RESUME, (resume_id,)).rowcount > 0
+        _delete_unused_blobs(conn, replaced)
     return deleted
 
-def save_chat_message(resume_id: str, role: str, content: str):
+def save_chat_message(resume_id: str, role: str, content: str) -> Dict[str, Any]:
     """Save a chat message."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        INSERT INTO chat_history (resume_id, role, content)
-        VALUES (?, ?, ?)
-    ''', (resume_id, role, content))
-    
-    conn.commit()
-    conn.close()
-
-def get_chat_history(resume_id: str) -> List[Dict[str, str]]:
-    """Get chat history for a resume."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT role, content FROM chat_history 
-        WHERE resume_id = ? 
-        ORDER BY created_at ASC
-    ''', (resume_id,))
-    rows = cursor.fetchall()
-    conn.close()
-    
-    return [{"role": row[0], "content": row[1]} for row in rows]
+    return save_chat_messages(resume_id, [{"role": role, "content": content}])[0]
+
+@timed("db")
+def save_chat_messages(resume_id: str, messages: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    """
+    Append several chat messages ({"role", "content"}, in order) in one transaction.
+    Returns them with the seq numbers they were given.
+    """
+    with transaction() as conn:
+        # A missing resume reserves nothing; the insert below then fails on its foreign key
+        reserved = conn.execute(SQL_RESERVE_CHAT_SEQ, (len(messages), resume_id)).fetchall()
+        last_seq = reserved[0][0] - len(messages) if reserved else 0
+        saved = [{"seq": last_seq + i, "role": message["role"], "content": message["content"]}
+                 for i, message in enumerate(messages, start=1)]
+        conn.executemany(SQL_SAVE_CHAT_MESSAGE, [(resume_id, m["seq"], m["role"], m["content"]) for m in saved])
+    return saved
+
+@timed("db")
+def get_chat_history(resume_id: str) -> List[Dict[str, Any]]:
+    """Get the whole chat history for a resume (see get_chat_history_page for long chats)."""
+    with connection() as conn:
+        rows = conn.execute(SQL_GET_CHAT_HISTORY, (resume_id,)).fetchall()
+
+    return [{"seq": row[0], "role": row[1], "content": row[2], "created_at": row[3]} for row in rows]
+
+@timed("db")
+def get_chat_history_page(resume_id: str, limit: int = 50, before: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Get one page of a chat, oldest first: the newest messages, or those just
+    before seq `before`. Pass the returned next_before back as before for the
+    older page (None when there are no more).
+    """
+    with connection() as conn:
+        if before is None:
+            rows = conn.execute(SQL_GET_CHAT_FIRST_PAGE, (resume_id, limit + 1)).fetchall()
+        else:
+            rows = conn.execute(SQL_GET_CHAT_PAGE, (resume_id, before, limit + 1)).fetchall()
+
+    items = [{"seq": row[0], "role": row[1], "content": row[2], "created_at": row[3]} for row in reversed(rows[:limit])]
+    return {"items": items, "next_before": items[0]["seq"] if len(rows) > limit else None}
+
+@timed("db")
+def get_chat_context(resume_id: str, max_messages: int) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    The rolling summary ({"summary", "covered_seq"} or None) and the newest
+    messages it doesn't cover yet (at most max_messages, oldest first, with seq).
+    Reads only the uncovered tail, so its cost doesn't grow with the chat.
+    """
+    with connection() as conn:
+        conn.execute('BEGIN')  # One snapshot for both reads
+        row = conn.execute(SQL_GET_CHAT_SUMMARY, (resume_id,)).fetchone()
+        summary = {"summary": row[0], "covered_seq": row[1]} if row else None
+        rows = conn.execute(SQL_GET_RECENT_CHAT_MESSAGES, (resume_id, row[1] if row else 0, max_messages)).fetchall()
+        conn.execute('COMMIT')
+
+    return summary, [{"seq": row[0], "role": row[1], "content": row[2]} for row in reversed(rows)]
+
+@timed("db")
+def get_chat_messages_to_fold(resume_id: str, keep: int, max_messages: int) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    The rolling summary (as in get_chat_context) and the oldest messages it
+    doesn't cover yet, excluding the `keep` newest messages of the chat (at
+    most max_messages, oldest first, with seq).
+    """
+    with connection() as conn:
+        conn.execute('BEGIN')  # One snapshot for both reads
+        row = conn.execute(SQL_GET_CHAT_SUMMARY, (resume_id,)).fetchone()
+        summary = {"summary": row[0], "covered_seq": row[1]} if row else None
+        rows = conn.execute(SQL_GET_CHAT_MESSAGES_TO_FOLD, (resume_id, row[1] if row else 0, resume_id, keep, max_messages)).fetchall()
+        conn.execute('COMMIT')
+
+    return summary, [{"seq": row[0], "role": row[1], "content": row[2]} for row in rows]
+
+@timed("db")
+def save_chat_summary(resume_id: str, summary: str, covered_seq: int):
+    """
+    Store the rolling summary of the messages up to covered_seq; never moves
+    back to an older one, and does nothing if that message was cleared meanwhile.
+    """
+    with transaction() as conn:
+        conn.execute(SQL_SAVE_CHAT_SUMMARY, (resume_id, summary, covered_seq, datetime.now(), resume_id, covered_seq))
+
+@timed("db")
+def clear_chat_history(resume_id: str):
+    """Delete all chat messages for a resume (keeps the resume)."""
+    with transaction() as conn:
+        conn.execute(SQL_CLEAR_CHAT_HISTORY, (resume_id,))
+        conn.execute(SQL_CLEAR_CHAT_SUMMARY, (resume_id,))
 
 # Initialize database on module import
 init_db()
-
@@ -1,13 +1,24 @@
 from docx import Document
+from docx.document import Document as DocumentObject
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
 from docx.shared import Inches, Pt
+from docx.text.paragraph import Paragraph
+from contextlib import contextmanager
+from copy import deepcopy
+from io import BytesIO
 import os
 import sys
-import uuid
 import time
-import subprocess
 import shutil
+import tempfile
+import threading
+import subprocess
+from typing import Dict, Iterator, List, Optional
 from .models import Resume
-from .utils import process_bullet_points
+from .utils import process_bullet_points, split_skill_category
+from .libreoffice_pool import find_libreoffice, get_libreoffice_pool
+from .metrics import span
 
 # Platform-specific imports for Word to PDF conversion
 if sys.platform == 'win32':
@@ -82,6 +93,39 @@ FONT_SIZE_CONTACT = 9  # Font size for contact info
 BULLET_INDENT = 0.25  # Left indent for bullet text
 BULLET_HANG = 0.11    # Hanging indent (bullet hangs to the left of text)
 
+# PDF backend:
+# "office" - render the Word template, then convert with LibreOffice / Word / docx2pdf
+# "fpdf"   - draw the PDF directly with fpdf2 (in-process, no office suite needed)
+PDF_BACKEND = os.environ.get("PDF_BACKEND", "office")
+
+# Scratch space for converters that only work on files. Every render gets its own
+# directory below this, removed as soon as the render finishes.
+SCRATCH_ROOT = os.environ.get("SCRATCH_ROOT", "./tmp/scratch")
+SCRATCH_MAX_AGE = 3600  # Seconds before a leftover scratch directory (crashed render) is swept
+
+@contextmanager
+def scratch_directory() -> Iterator[str]:
+    """A private directory below SCRATCH_ROOT, deleted with its contents on exit."""
+    os.makedirs(SCRATCH_ROOT, exist_ok=True)
+    path = tempfile.mkdtemp(prefix="render_", dir=SCRATCH_ROOT)
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+def clean_scratch_root(max_age: float = SCRATCH_MAX_AGE):
+    """Remove scratch directories left behind by renders that never finished (e.g. a killed worker)."""
+    if not os.path.isdir(SCRATCH_ROOT):
+        return
+    cutoff = time.time() - max_age
+    for name in os.listdir(SCRATCH_ROOT):
+        path = os.path.join(SCRATCH_ROOT, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+        except FileNotFoundError:
+            pass
+
 def apply_font(run, size=None, bold=False):
     """Apply font name and optionally size and bold to a run."""
     run.font.name = FONT_NAME
@@ -121,14 +165,13 @@ def format_skills_with_bold_category(paragraph, skills, font_size=None):
         font_size = FONT_SIZE_SKILLS
     paragraph.clear()
     for i, skill_line in enumerate(skills):
-        if ':' in skill_line:
-            # Split into category and skills
-            category, skill_list = skill_line.split(':', 1)
+        category, skill_list = split_skill_category(skill_line)
+        if category is not None:
             # Add bold category
-            bold_run = paragraph.add_run(category.strip() + ': ')
+            bold_run = paragraph.add_run(category + ': ')
             apply_font(bold_run, font_size, bold=True)
             # Add regular skills
-            regular_run = paragraph.add_run(skill_list.strip())
+            regular_run = paragraph.add_run(skill_list)
             apply_font(regular_run, font_size)
         else:
             # No category, just add as is
@@ -144,37 +187,7 @@ def convert_with_libreoffice(word_path: str, output_dir: str) -> bool:
     Convert Word to PDF using LibreOffice command line.
     Returns True if successful, False if LibreOffice not found.
     """
-    # Common LibreOffice paths by platform
-    libreoffice_paths = []
-    
-    if sys.platform == 'win32':
-        libreoffice_paths = [
-            shutil.which('soffice'),
-            r'C:\Program Files\LibreOffice\program\soffice.exe',
-            r'C:\Program Files (x86)\LibreOffice\program\soffice.exe',
-            os.path.expandvars(r'%PROGRAMFILES%\LibreOffice\program\soffice.exe'),
-        ]
-    elif sys.platform == 'darwin':
-        libreoffice_paths = [
-            '/Applications/LibreOffice.app/Contents/MacOS/soffice',
-            shutil.which('soffice'),
-            shutil.which('libreoffice'),
-        ]
-    elif sys.platform == 'linux':
-        libreoffice_paths = [
-            shutil.which('soffice'),
-            shutil.which('libreoffice'),
-            '/usr/bin/soffice',
-            '/usr/bin/libreoffice',
-        ]
-    
-    # Find LibreOffice executable
-    soffice_path = None
-    for path in libreoffice_paths:
-        if path and os.path.exists(path):
-            soffice_path = path
-            break
-    
+    soffice_path = find_libreoffice()
     if not soffice_path:
         return False
     
@@ -197,51 +210,219 @@ def convert_with_libreoffice(word_path: str, output_dir: str) -> bool:
         return False
 
 
-def generate_pdf_resume(resume: Resume) -> str:
+def generate_pdf_resume(resume: Resume, backend: str = None) -> bytes:
     """
-    Generate PDF resume from Word template.
-    All platforms: Tries LibreOffice first (faster), falls back to platform-specific method.
+    Generate PDF resume and return its bytes.
+    backend="fpdf": Draws the PDF directly with fpdf2 in memory, no Word document or office suite.
+    backend="office": Generates from the Word template. All platforms: Tries the persistent
+    LibreOffice worker pool first, then a one-shot LibreOffice process, then falls back
+    to platform-specific method.
     - Windows fallback: Word COM
     - Mac/Linux fallback: docx2pdf
+    The office converters need files, so they work in a scratch directory that is
+    removed once the PDF has been read back.
     """
+    backend = backend or PDF_BACKEND
+    if backend == "fpdf":
+        from .pdf_renderer import render_pdf_resume
+        with span("pdf_render", "fpdf"):
+            return render_pdf_resume(resume)
+    if backend != "office":
+        raise ValueError(f"Unknown PDF backend: {backend}")
+
     # First generate the Word document from template
-    word_path = generate_word_resume(resume)
-    pdf_path = word_path.replace('.docx', '.pdf')
-    output_dir = os.path.dirname(word_path) or '.'
+    return convert_docx_to_pdf(generate_word_resume(resume))
+
+def convert_docx_to_pdf(docx: bytes) -> bytes:
+    """Convert .docx bytes to PDF bytes with the office converters, inside a scratch directory."""
+    with scratch_directory() as output_dir:
+        word_path = os.path.join(output_dir, "resume.docx")
+        pdf_path = os.path.join(output_dir, "resume.pdf")
+        with open(word_path, "wb") as f:
+            f.write(docx)
+        convert_word_file_to_pdf(word_path, pdf_path, output_dir)
+        with open(pdf_path, "rb") as f:
+            return f.read()
+
+def convert_word_file_to_pdf(word_path: str, pdf_path: str, output_dir: str):
+    """Convert word_path to pdf_path (same base name inside output_dir) with the first converter that works."""
+    # Try the LibreOffice worker pool first (no cold start per request)
+    pool = get_libreoffice_pool()
+    if pool is not None:
+        try:
+            with span("pdf_convert", "libreoffice_pool"):
+                pool.convert(word_path, pdf_path)
+            return
+        except Exception:
+            pass  # Counted as a pdf_convert error; fall through to a one-shot process
     
-    # Try LibreOffice first on all platforms (faster)
-    if convert_with_libreoffice(word_path, output_dir):
-        print("PDF converted using LibreOffice (fast)")
-        return pdf_path
+    # Then a one-shot LibreOffice process on all platforms
+    with span("pdf_convert", "libreoffice"):
+        converted = convert_with_libreoffice(word_path, output_dir)
+    if converted:
+        return
     
     # Fallback methods
     if sys.platform == 'win32':
         # Windows fallback: Use Word COM
         print("LibreOffice not found, using Word COM...")
-        convert_word_to_pdf_hidden(word_path, pdf_path)
+        with span("pdf_convert", "word_com"):
+            convert_word_to_pdf_hidden(word_path, pdf_path)
     else:
         # Mac/Linux fallback: docx2pdf
         print("LibreOffice not found, falling back to docx2pdf...")
         try:
             from docx2pdf import convert as docx2pdf_convert
-            docx2pdf_convert(word_path, pdf_path)
+            with span("pdf_convert", "docx2pdf"):
+                docx2pdf_convert(word_path, pdf_path)
         except ImportError:
             raise NotImplementedError(
                 "PDF conversion requires either LibreOffice or docx2pdf with Microsoft Word. "
                 "Install LibreOffice: brew install --cask libreoffice"
             )
-    
-    return pdf_path
 
-def generate_word_resume(resume: Resume) -> str:
-    template_path = "backend/templates/resume_template.docx"
-    
-    # Ensure all experience entries are present for robust templating
-    webkorps_exp = next((exp for exp in resume.experience if exp.company == "WebKorps"), None)
-    ibm_exp = next((exp for exp in resume.experience if exp.company == "IBM"), None)
-    americankorps_exp = next((exp for exp in resume.experience if exp.company == "AmericanKorps"), None)
+# =============================================================================
+# COMPILED TEMPLATE - parsed once, placeholder paragraphs indexed into slots
+# =============================================================================
+
+TEMPLATE_PATH = "backend/templates/resume_template.docx"
+
+# Placeholders in the order they are filled within one paragraph
+TEMPLATE_PLACEHOLDERS = (
+    "name", "email", "phone", "location", "summary", "skills",
+    "webkorps_title", "ibm_title", "americankorps_title",
+    "webkorps_description", "ibm_description", "americankorps_description",
+    "certifications",
+)
+
+# Template slot prefix -> company name in Resume.experience
+TEMPLATE_COMPANIES = {
+    "webkorps": "WebKorps",
+    "ibm": "IBM",
+    "americankorps": "AmericanKorps",
+}
+
+
+class CompiledTemplate:
+    """
+    The Word template parsed once, with a slot map from body position to the
+    placeholders in that paragraph. Renders fill a copy of the pristine body
+    instead of re-reading the file and scanning every paragraph.
+    Each thread gets its own parsed Document, since lxml trees must not be
+    shared between threads.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.stamp = _template_stamp(path)
+        with open(path, "rb") as f:
+            self.data = f.read()
+        self._local = threading.local()
+        document = Document(BytesIO(self.data))
+        self.slots: Dict[int, List[str]] = {}
+        for index, element in enumerate(document.element.body):
+            if element.tag != qn("w:p"):
+                continue
+            text = Paragraph(element, document._body).text
+            names = [name for name in TEMPLATE_PLACEHOLDERS if f"{{{{{name}}}}}" in text]
+            if names:
+                self.slots[index] = names
+
+    def new_document(self) -> DocumentObject:
+        """This thread's Document with its body reset to the pristine template."""
+        local = self._local
+        if getattr(local, "document", None) is None:
+            local.document = Document(BytesIO(self.data))
+            local.pristine = [deepcopy(child) for child in local.document.element.body]
+        local.document.element.body[:] = [deepcopy(child) for child in local.pristine]
+        return local.document
+
+
+def _template_stamp(path: str):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+_compiled_template: Optional[CompiledTemplate] = None
+_compiled_template_lock = threading.Lock()
+
 
-    if not os.path.exists(template_path):
+def get_compiled_template() -> CompiledTemplate:
+    """Return the compiled template, recompiling it when the file on disk changes."""
+    global _compiled_template
+    stamp = _template_stamp(TEMPLATE_PATH)
+    with _compiled_template_lock:
+        if _compiled_template is None or _compiled_template.stamp != stamp:
+            _compiled_template = CompiledTemplate(TEMPLATE_PATH)
+        return _compiled_template
+
+
+def _insert_bullets_after(paragraph, points, font_size):
+    """Insert a bullet paragraph for each point directly after paragraph, in order."""
+    anchor = paragraph._element
+    for point in points:
+        element = OxmlElement("w:p")
+        anchor.addnext(element)
+        apply_bullet_format(Paragraph(element, paragraph._parent), point, font_size)
+        anchor = element
+
+
+def fill_template(document: DocumentObject, slots: Dict[int, List[str]], resume: Resume):
+    """Replace the placeholders of a fresh template body using the slot map."""
+    experiences = {
+        prefix: next((exp for exp in resume.experience if exp.company == company), None)
+        for prefix, company in TEMPLATE_COMPANIES.items()
+    }
+    body = document.element.body
+    children = list(body)
+    # Resolve every slot before inserting paragraphs shifts the positions
+    slot_paragraphs = [(Paragraph(children[index], document._body), names) for index, names in slots.items()]
+
+    for paragraph, names in slot_paragraphs:
+        for name in names:
+            placeholder = f"{{{{{name}}}}}"
+            if name in ("name", "email", "phone", "location"):
+                paragraph.text = paragraph.text.replace(placeholder, getattr(resume, name) or "")
+            elif name == "summary":
+                paragraph.clear()
+                apply_font(paragraph.add_run(resume.summary), FONT_SIZE_SUMMARY)
+            elif name == "skills":
+                format_skills_with_bold_category(paragraph, resume.skills, FONT_SIZE_SKILLS)
+            elif name.endswith("_title"):
+                exp = experiences[name[:-len("_title")]]
+                paragraph.clear()
+                if exp:
+                    apply_font(paragraph.add_run(exp.title), FONT_SIZE_JOB_TITLE, bold=True)
+                    date_run = paragraph.add_run(f"\t\t{exp.start_date}-{exp.end_date or 'Present'}")
+                    apply_font(date_run, FONT_SIZE_DATE)
+            elif name.endswith("_description"):
+                exp = experiences[name[:-len("_description")]]
+                description_points = process_bullet_points(exp.description) if exp else []
+                if description_points:
+                    # One paragraph per bullet
+                    apply_bullet_format(paragraph, description_points[0], FONT_SIZE_BULLET)
+                    _insert_bullets_after(paragraph, description_points[1:], FONT_SIZE_BULLET)
+                elif not exp:
+                    paragraph.clear()
+            elif name == "certifications":
+                if resume.certifications:
+                    apply_bullet_format(paragraph, resume.certifications[0], FONT_SIZE_CERTIFICATIONS)
+                    _insert_bullets_after(paragraph, resume.certifications[1:], FONT_SIZE_CERTIFICATIONS)
+                else:
+                    paragraph.clear()
+
+
+def render_template(resume: Resume) -> DocumentObject:
+    """Fill the compiled Word template for resume. The Document is reused by the next render on this thread."""
+    template = get_compiled_template()
+    document = template.new_document()
+    fill_template(document, template.slots, resume)
+    return document
+
+
+def generate_word_resume(resume: Resume) -> bytes:
+    """Render the resume as a .docx in memory and return its bytes."""
+    if not os.path.exists(TEMPLATE_PATH):
         # Fallback to basic generation if template is missing or not a file
         document = Document()
         document.add_heading(resume.name, level=1)
@@ -290,135 +471,10 @@ def generate_word_resume(resume: Resume) -> str:
             for cert in resume.certifications:
                 add_bullet_paragraph(document, cert, FONT_SIZE_CERTIFICATIONS)
     else:
-        document = Document(template_path)
+        with span("template", "fill"):
+            document = render_template(resume)
 
-        # Collect all paragraphs first to avoid iteration issues
-        paragraphs_list = list(document.paragraphs)
-        description_paragraphs_to_replace = []
-        
-        # Helper function to check if placeholder exists in paragraph (handles split runs)
-        def has_placeholder(para, placeholder):
-            # Check full paragraph text
-            if placeholder in para.text:
-                return True
-            # Check if placeholder is split across runs
-            full_text = "".join([run.text for run in para.runs])
-            if placeholder in full_text:
-                return True
-            return False
-
-        for paragraph in paragraphs_list:
-            # Replace top-level contact info, summary, skills
-            if "{{name}}" in paragraph.text:
-                paragraph.text = paragraph.text.replace("{{name}}", resume.name)
-            if "{{email}}" in paragraph.text:
-                paragraph.text = paragraph.text.replace("{{email}}", resume.email)
-            if "{{phone}}" in paragraph.text:
-                paragraph.text = paragraph.text.replace("{{phone}}", resume.phone if resume.phone else "")
-            if "{{location}}" in paragraph.text:
-                paragraph.text = paragraph.text.replace("{{location}}", resume.location if resume.location else "")
-            if "{{summary}}" in paragraph.text:
-                paragraph.clear()
-                run = paragraph.add_run(resume.summary)
-                apply_font(run, FONT_SIZE_SUMMARY)
-            if "{{skills}}" in paragraph.text:
-                # Use the new formatting function for skills with bold categories
-                format_skills_with_bold_category(paragraph, resume.skills, FONT_SIZE_SKILLS)
-            
-            # --- Handle Experience Section ---
-            # Replace titles with font size and include dates
-            if "{{webkorps_title}}" in paragraph.text:
-                paragraph.clear()
-                if webkorps_exp:
-                    # Add title (bold)
-                    title_run = paragraph.add_run(webkorps_exp.title)
-                    apply_font(title_run, FONT_SIZE_JOB_TITLE, bold=True)
-                    # Add tab and date
-                    date_text = f"\t\t{webkorps_exp.start_date}-{webkorps_exp.end_date or 'Present'}"
-                    date_run = paragraph.add_run(date_text)
-                    apply_font(date_run, FONT_SIZE_DATE)
-            
-            if "{{ibm_title}}" in paragraph.text:
-                paragraph.clear()
-                if ibm_exp:
-                    # Add title (bold)
-                    title_run = paragraph.add_run(ibm_exp.title)
-                    apply_font(title_run, FONT_SIZE_JOB_TITLE, bold=True)
-                    # Add tab and date
-                    date_text = f"\t\t{ibm_exp.start_date}-{ibm_exp.end_date or 'Present'}"
-                    date_run = paragraph.add_run(date_text)
-                    apply_font(date_run, FONT_SIZE_DATE)
-            
-            if "{{americankorps_title}}" in paragraph.text:
-                paragraph.clear()
-                if americankorps_exp:
-                    # Add title (bold)
-                    title_run = paragraph.add_run(americankorps_exp.title)
-                    apply_font(title_run, FONT_SIZE_JOB_TITLE, bold=True)
-                    # Add tab and date
-                    date_text = f"\t\t{americankorps_exp.start_date}-{americankorps_exp.end_date or 'Present'}"
-                    date_run = paragraph.add_run(date_text)
-                    apply_font(date_run, FONT_SIZE_DATE)
-            
-            # WebKorps Description - mark for replacement
-            if has_placeholder(paragraph, "{{webkorps_description}}") or "{{webkorps_description}}" in paragraph.text:
-                description_paragraphs_to_replace.append(("webkorps", paragraph, webkorps_exp))
-            
-            # IBM Description
-            if has_placeholder(paragraph, "{{ibm_description}}") or "{{ibm_description}}" in paragraph.text:
-                description_paragraphs_to_replace.append(("ibm", paragraph, ibm_exp))
-            
-            # AmericanKorps Description
-            if has_placeholder(paragraph, "{{americankorps_description}}") or "{{americankorps_description}}" in paragraph.text:
-                description_paragraphs_to_replace.append(("americankorps", paragraph, americankorps_exp))
-            
-            # --- Handle Certifications Section ---
-            if "{{certifications}}" in paragraph.text or "• {{certifications}}" in paragraph.text:
-                # Get parent for inserting additional certification paragraphs
-                parent = paragraph._element.getparent()
-                para_index = parent.index(paragraph._element)
-                
-                if resume.certifications:
-                    # First certification uses the existing paragraph
-                    apply_bullet_format(paragraph, resume.certifications[0], FONT_SIZE_CERTIFICATIONS)
-                    
-                    # Add remaining certifications as new paragraphs
-                    for i, cert in enumerate(resume.certifications[1:], 1):
-                        cert_para = add_bullet_paragraph(document, cert, FONT_SIZE_CERTIFICATIONS)
-                        # Move to correct position
-                        cert_para._element.getparent().remove(cert_para._element)
-                        parent.insert(para_index + i, cert_para._element)
-                else:
-                    paragraph.clear()
-
-        # Now handle description paragraphs - create separate paragraphs for each bullet
-        for exp_type, para, exp in description_paragraphs_to_replace:
-            if exp:
-                description_points = process_bullet_points(exp.description)
-                if description_points:
-                    # Get parent element and index for inserting new paragraphs
-                    parent = para._element.getparent()
-                    para_index = parent.index(para._element)
-                    
-                    # Set first paragraph to bullet style
-                    apply_bullet_format(para, description_points[0], FONT_SIZE_BULLET)
-                    
-                    # Create and insert remaining bullets as separate paragraphs
-                    # We need to insert in reverse order to maintain correct positions
-                    for i in range(len(description_points) - 1, 0, -1):
-                        point = description_points[i]
-                        # Create new paragraph with bullet style
-                        temp_para = add_bullet_paragraph(document, point, FONT_SIZE_BULLET)
-                        # Remove from end and insert at correct position
-                        temp_para._element.getparent().remove(temp_para._element)
-                        parent.insert(para_index + 1, temp_para._element)
-            else:
-                para.clear()
-
-
-    # Use unique filename to avoid permission issues when file is locked
-    unique_id = str(uuid.uuid4())[:8]
-    file_path = f"./tmp/{resume.name.replace(' ', '_')}_{unique_id}_resume.docx"
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    document.save(file_path)
-    return file_path
\ No newline at end of file
+    with span("template", "save"):
+        buffer = BytesIO()
+        document.save(buffer)
+    return buffer.getvalue()
@@ -0,0 +1,110 @@
+import json
+from typing import Any, List, Optional, Tuple
+
+
+class IncrementalJSONParser:
+    """
+    Incremental parser for a streamed JSON object.
+
+    Feed it text chunks as they arrive; it reports each top-level field once
+    its value is complete, and each element of a top-level array as soon as
+    that element is complete (so e.g. every experience entry can be delivered
+    before the whole array is closed).
+
+    feed() returns a list of events:
+        ("item", key, index, value)  - element `index` of the array under `key`
+        ("field", key, value)        - top-level field `key` is complete
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._expect_value = False
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self._item_start: Optional[int] = None
+        self._item_index = 0
+
+    def _in_top_level_array(self) -> bool:
+        return len(self._stack) == 2 and self._stack[-1] == "["
+
+    def _mark_value_start(self, pos: int):
+        """Record where a value begins, either a top-level field or an array element."""
+        if len(self._stack) == 1 and self._expect_value and self._value_start is None:
+            self._value_start = pos
+        elif self._in_top_level_array() and self._item_start is None:
+            self._item_start = pos
+
+    def _finish_field(self, end: int, events: List[Tuple[Any, ...]]):
+        if self._value_start is not None and self._key is not None:
+            events.append(("field", self._key, json.loads(self._text[self._value_start:end])))
+        self._key = None
+        self._value_start = None
+        self._expect_value = False
+
+    def _finish_item(self, end: int, events: List[Tuple[Any, ...]]):
+        if self._item_start is not None:
+            events.append(("item", self._key, self._item_index, json.loads(self._text[self._item_start:end])))
+            self._item_index += 1
+        self._item_start = None
+
+    def feed(self, chunk: str) -> List[Tuple[Any, ...]]:
+        self._text += chunk
+        events: List[Tuple[Any, ...]] = []
+        text = self._text
+
+        while self._pos < len(text):
+            pos = self._pos
+            ch = text[pos]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._key = json.loads(text[self._key_start:pos + 1])
+                        self._key_start = None
+                continue
+
+            if ch.isspace():
+                continue
+
+            depth = len(self._stack)
+            if ch == '"':
+                self._in_string = True
+                if depth == 1 and not self._expect_value:
+                    self._key_start = pos
+                else:
+                    self._mark_value_start(pos)
+            elif ch in "{[":
+                self._mark_value_start(pos)
+                if depth == 1 and ch == "[":
+                    self._item_index = 0
+                self._stack.append(ch)
+            elif ch in "}]":
+                if self._in_top_level_array():
+                    self._finish_item(pos, events)
+                self._stack.pop()
+                if not self._stack:
+                    self._finish_field(pos, events)
+            elif ch == ",":
+                if depth == 1:
+                    self._finish_field(pos, events)
+                elif self._in_top_level_array():
+                    self._finish_item(pos, events)
+            elif ch == ":":
+                if depth == 1:
+                    self._expect_value = True
+            else:
+                # Start of a number, true, false or null
+                self._mark_value_start(pos)
+
+        return events
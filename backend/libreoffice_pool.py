@@ -0,0 +1,306 @@
+import os
+import sys
+import shutil
+import socket
+import subprocess
+import threading
+import queue
+import time
+import atexit
+from typing import List, Optional
+
+# The UNO bridge ships with LibreOffice itself (python3-uno on Debian/Ubuntu,
+# the bundled python on Windows/Mac). Without it we fall back to one-shot
+# `soffice --convert-to` processes.
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+except ImportError:
+    uno = None
+
+
+# =============================================================================
+# POOL CONFIGURATION - Override with environment variables
+# =============================================================================
+
+LIBREOFFICE_POOL_SIZE = int(os.environ.get("LIBREOFFICE_POOL_SIZE", "2"))  # Number of long-lived soffice workers
+LIBREOFFICE_MAX_JOBS_PER_WORKER = int(os.environ.get("LIBREOFFICE_MAX_JOBS_PER_WORKER", "50"))  # Recycle worker after N conversions
+LIBREOFFICE_STARTUP_TIMEOUT = 30  # Seconds to wait for a worker to accept UNO connections
+LIBREOFFICE_ACQUIRE_TIMEOUT = 60  # Seconds to wait for a free worker
+LIBREOFFICE_PROFILE_ROOT = "./tmp/libreoffice_profiles"  # Each worker gets its own profile dir below this
+
+
+def find_libreoffice() -> Optional[str]:
+    """Return the path of the soffice executable, or None if LibreOffice is not installed."""
+    libreoffice_paths = []
+
+    if sys.platform == 'win32':
+        libreoffice_paths = [
+            shutil.which('soffice'),
+            r'C:\Program Files\LibreOffice\program\soffice.exe',
+            r'C:\Program Files (x86)\LibreOffice\program\soffice.exe',
+            os.path.expandvars(r'%PROGRAMFILES%\LibreOffice\program\soffice.exe'),
+        ]
+    elif sys.platform == 'darwin':
+        libreoffice_paths = [
+            '/Applications/LibreOffice.app/Contents/MacOS/soffice',
+            shutil.which('soffice'),
+            shutil.which('libreoffice'),
+        ]
+    elif sys.platform == 'linux':
+        libreoffice_paths = [
+            shutil.which('soffice'),
+            shutil.which('libreoffice'),
+            '/usr/bin/soffice',
+            '/usr/bin/libreoffice',
+        ]
+
+    for path in libreoffice_paths:
+        if path and os.path.exists(path):
+            return path
+    return None
+
+
+def _free_port() -> int:
+    """Ask the OS for a free localhost port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _process_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    if sys.platform == 'win32':
+        return True  # os.kill would terminate the process; leave its profiles alone
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # Exists, owned by another user
+    return True
+
+
+def remove_stale_profiles():
+    """Remove worker profiles ({pid}_worker_{i}) left behind by processes that no longer run."""
+    if not os.path.isdir(LIBREOFFICE_PROFILE_ROOT):
+        return
+    for name in os.listdir(LIBREOFFICE_PROFILE_ROOT):
+        pid, _, _ = name.partition("_")
+        if pid.isdigit() and not _process_alive(int(pid)):
+            shutil.rmtree(os.path.join(LIBREOFFICE_PROFILE_ROOT, name), ignore_errors=True)
+
+
+def _properties(**kwargs):
+    """Build a tuple of UNO PropertyValues from keyword arguments."""
+    props = []
+    for name, value in kwargs.items():
+        prop = PropertyValue()
+        prop.Name = name
+        prop.Value = value
+        props.append(prop)
+    return tuple(props)
+
+
+class LibreOfficeWorker:
+    """
+    A single headless soffice process listening on a local UNO socket.
+    Each worker has its own user profile so workers never contend for locks.
+    """
+
+    def __init__(self, soffice_path: str, index: int):
+        self.soffice_path = soffice_path
+        self.index = index
+        # Include the pid so pools in different uvicorn workers never share a profile
+        self.profile_dir = os.path.abspath(os.path.join(LIBREOFFICE_PROFILE_ROOT, f"{os.getpid()}_worker_{index}"))
+        self.port = None
+        self.process = None
+        self.desktop = None
+        self.jobs_done = 0
+
+    def start(self):
+        """Launch soffice and wait until it accepts UNO connections."""
+        os.makedirs(self.profile_dir, exist_ok=True)
+        self.port = _free_port()
+        self.jobs_done = 0
+        profile_url = uno.systemPathToFileUrl(self.profile_dir)
+        self.process = subprocess.Popen([
+            self.soffice_path,
+            '--headless',
+            '--invisible',
+            '--nologo',
+            '--nodefault',
+            '--norestore',
+            '--nolockcheck',
+            f'-env:UserInstallation={profile_url}',
+            f'--accept=socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext',
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        deadline = time.time() + LIBREOFFICE_STARTUP_TIMEOUT
+        while True:
+            try:
+                context = resolver.resolve(
+                    f"uno:socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext"
+                )
+                self.desktop = context.ServiceManager.createInstanceWithContext(
+                    "com.sun.star.frame.Desktop", context
+                )
+                return
+            except Exception:
+                if self.process.poll() is not None or time.time() > deadline:
+                    self.stop()
+                    raise RuntimeError(f"LibreOffice worker {self.index} failed to start")
+                time.sleep(0.25)
+
+    def is_healthy(self) -> bool:
+        """Check that the process is alive and still answers over UNO."""
+        if self.process is None or self.process.poll() is not None or self.desktop is None:
+            return False
+        try:
+            self.desktop.getComponents()
+            return True
+        except Exception:
+            return False
+
+    def convert(self, word_path: str, pdf_path: str):
+        """Convert a .docx file to PDF inside this worker."""
+        word_url = uno.systemPathToFileUrl(os.path.abspath(word_path))
+        pdf_url = uno.systemPathToFileUrl(os.path.abspath(pdf_path))
+        doc = self.desktop.loadComponentFromURL(word_url, "_blank", 0, _properties(Hidden=True))
+        try:
+            doc.storeToURL(pdf_url, _properties(FilterName="writer_pdf_Export"))
+        finally:
+            doc.close(True)
+        self.jobs_done += 1
+
+    def stop(self, remove_profile: bool = True):
+        """Terminate the soffice process and, unless it is about to restart, remove its profile."""
+        if self.desktop is not None:
+            try:
+                self.desktop.terminate()
+            except Exception:
+                pass
+            self.desktop = None
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+        if remove_profile:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+    def restart(self):
+        # Keep the profile: it is already initialised, which makes the restart faster
+        self.stop(remove_profile=False)
+        self.start()
+
+
+class LibreOfficePool:
+    """
+    Pool of long-lived LibreOffice workers. Conversion jobs borrow an idle
+    worker, so cold start is paid once per worker instead of once per PDF.
+    Workers are health-checked before use and recycled after
+    LIBREOFFICE_MAX_JOBS_PER_WORKER conversions.
+    """
+
+    def __init__(self, soffice_path: str, size: int = LIBREOFFICE_POOL_SIZE):
+        self.soffice_path = soffice_path
+        self.size = size
+        self.workers: List[LibreOfficeWorker] = []
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+        self._failed = False  # No worker could start; conversions go straight to the fallbacks
+
+    def start(self):
+        """Start all workers (idempotent). Raises RuntimeError when none could start."""
+        with self._lock:
+            if self._started:
+                return
+            if self._failed:
+                raise RuntimeError("LibreOffice pool could not start any workers")
+            remove_stale_profiles()
+            for i in range(self.size):
+                worker = LibreOfficeWorker(self.soffice_path, i)
+                try:
+                    worker.start()
+                except RuntimeError as e:
+                    print(f"LibreOffice pool: {e}")
+                    continue
+                self.workers.append(worker)
+                self._idle.put(worker)
+            if not self.workers:
+                self._failed = True
+                raise RuntimeError("LibreOffice pool could not start any workers")
+            self._started = True
+
+    def convert(self, word_path: str, pdf_path: str):
+        """Convert word_path to pdf_path using the next free worker."""
+        self.start()
+        try:
+            worker = self._idle.get(timeout=LIBREOFFICE_ACQUIRE_TIMEOUT)
+        except queue.Empty:
+            raise TimeoutError("No LibreOffice worker became available")
+
+        try:
+            if not worker.is_healthy():
+                print(f"LibreOffice pool: worker {worker.index} unhealthy, restarting")
+                worker.restart()
+            try:
+                worker.convert(word_path, pdf_path)
+            except Exception:
+                # A failed job may leave the worker wedged; start fresh next time
+                worker.restart()
+                raise
+            if worker.jobs_done >= LIBREOFFICE_MAX_JOBS_PER_WORKER:
+                worker.restart()
+        finally:
+            self._idle.put(worker)
+
+    def shutdown(self):
+        with self._lock:
+            for worker in self.workers:
+                worker.stop()
+            self.workers = []
+            self._idle = queue.Queue()
+            self._started = False
+            self._failed = False
+
+
+_pool: Optional[LibreOfficePool] = None
+_pool_lock = threading.Lock()
+
+
+def get_libreoffice_pool() -> Optional[LibreOfficePool]:
+    """
+    Return the shared pool, or None when LibreOffice or the UNO bridge is unavailable
+    or the pool is disabled (LIBREOFFICE_POOL_SIZE=0).
+    """
+    global _pool
+    if uno is None or LIBREOFFICE_POOL_SIZE <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            soffice_path = find_libreoffice()
+            if not soffice_path:
+                return None
+            _pool = LibreOfficePool(soffice_path)
+        return _pool
+
+
+def shutdown_libreoffice_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+atexit.register(shutdown_libreoffice_pool)
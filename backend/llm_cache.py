@@ -0,0 +1,130 @@
+import hashlib
+import os
+import re
+import threading
+import time
+import unicodedata
+from typing import Dict, Optional
+from .database import get_pool
+
+# =============================================================================
+# LLM CACHE CONFIGURATION - Override with environment variables
+# =============================================================================
+
+LLM_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", "./data/llm_cache.db")  # Next to resumes.db
+LLM_CACHE_TTL_SECONDS = int(os.environ.get("LLM_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))  # 30 days
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "2000"))
+
+# Tracking noise that differs between copies of the same job posting
+_TRACKING_PARAM = re.compile(r'([?&])(utm_[a-z]+|gh_src|gh_jid|src|ref|refid|trk|trackingId)=[^&\s]*', re.IGNORECASE)
+_TRACKING_TAG = re.compile(r'#LI-[A-Za-z0-9]+')
+_DANGLING_SEPARATOR = re.compile(r'[?&]+(?=\s|$)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_job_description(text: str) -> str:
+    """
+    Normalize a job description so re-pastes of the same posting hash the same:
+    unicode compatibility forms, tracking URL parameters and #LI- tags removed,
+    all whitespace collapsed.
+    """
+    text = unicodedata.normalize("NFKC", text)
+    text = _TRACKING_PARAM.sub(r'\1', text)
+    text = _DANGLING_SEPARATOR.sub('', text.replace('?&', '?').replace('&&', '&'))
+    text = _TRACKING_TAG.sub('', text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def make_cache_key(job_description_text: str, base_resume_json: str, prompt_version: str, model: str) -> str:
+    """Hash of everything that determines the completion for a tailoring request."""
+    digest = hashlib.sha256()
+    for part in (normalize_job_description(job_description_text), base_resume_json, prompt_version, model):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def init_llm_cache():
+    """Create the cache table if it doesn't exist."""
+    os.makedirs(os.path.dirname(LLM_CACHE_PATH), exist_ok=True)
+
+    with get_pool(LLM_CACHE_PATH).transaction() as conn:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used_at)')
+
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "bypassed": 0, "stores": 0, "evictions": 0}
+
+
+def _count(name: str, amount: int = 1):
+    with _stats_lock:
+        _stats[name] += amount
+
+
+def get_cached_response(key: str) -> Optional[str]:
+    """Return the cached completion text for key, or None if missing or expired."""
+    pool = get_pool(LLM_CACHE_PATH)
+    with pool.connection() as conn:
+        row = conn.execute('SELECT response, created_at FROM llm_cache WHERE key = ?', (key,)).fetchone()
+
+    now = time.time()
+    if row and now - row[1] <= LLM_CACHE_TTL_SECONDS:
+        with pool.transaction() as conn:
+            conn.execute('UPDATE llm_cache SET last_used_at = ? WHERE key = ?', (now, key))
+        _count("hits")
+        return row[0]
+
+    _count("misses")
+    return None
+
+
+def record_bypass():
+    """Count a lookup skipped because the caller asked to regenerate."""
+    _count("bypassed")
+
+
+def store_response(key: str, model: str, response: str):
+    """Store a completion, then drop expired entries and trim to LLM_CACHE_MAX_ENTRIES."""
+    now = time.time()
+    with get_pool(LLM_CACHE_PATH).transaction() as conn:
+        conn.execute('''
+            INSERT OR REPLACE INTO llm_cache (key, model, response, created_at, last_used_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (key, model, response, now, now))
+
+        evicted = conn.execute('DELETE FROM llm_cache WHERE created_at < ?', (now - LLM_CACHE_TTL_SECONDS,)).rowcount
+        evicted += conn.execute('''
+            DELETE FROM llm_cache WHERE key IN (
+                SELECT key FROM llm_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+            )
+        ''', (LLM_CACHE_MAX_ENTRIES,)).rowcount
+
+    _count("stores")
+    _count("evictions", evicted)
+
+
+def get_cache_stats() -> Dict[str, float]:
+    with get_pool(LLM_CACHE_PATH).connection() as conn:
+        entries = conn.execute('SELECT COUNT(*) FROM llm_cache').fetchone()[0]
+
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    stats["entries"] = entries
+    stats["max_entries"] = LLM_CACHE_MAX_ENTRIES
+    stats["ttl_seconds"] = LLM_CACHE_TTL_SECONDS
+    return stats
+
+
+# Initialize cache table on module import
+init_llm_cache()
@@ -1,17 +1,31 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 from .models import Resume, Experience, Education, JobDescription
-from .document_generator import generate_pdf_resume, generate_word_resume
-from .openai_processor import tailor_resume 
+from .document_generator import get_compiled_template, clean_scratch_root, TEMPLATE_PATH
+from .openai_processor import tailor_resume, stream_tailor_resume, request_tailored_resume, regenerate_sections, tailor_flight, STREAMED_SECTIONS
+from .openai_client import chat_completion, stream_chat_completion, close_client
+from .render_cache import render_cache
+from .render_pool import render_pool, render_flight, render_document, render_status, prerender, schedule_prerender, RenderQueueFull, EAGER_PRERENDER
+from .resume_cache import resume_cache
+from .resume_validator import validate_resume
+from .chat_context import build_chat_messages, schedule_chat_compaction, CHAT_MODEL
+from .metrics import metrics, collect_spans, record_span, server_timing_header, SERVER_TIMING
+from .libreoffice_pool import get_libreoffice_pool, shutdown_libreoffice_pool
+from .utils import format_sse
+from . import batch
+from . import llm_cache
 from . import database as db
-import openai
+import asyncio
 import uuid 
 import os
 import time
+import threading
+from contextlib import asynccontextmanager
+from urllib.parse import quote
 from dotenv import dotenv_values
 
 # Load environment variables from .env file
@@ -20,7 +34,31 @@ config = dotenv_values(".env")
 # Set OpenAI API key from environment variable or .env file
 os.environ["OPENAI_API_KEY"] = config.get("OPENAI_API_KEY", os.environ.get("OPENAI_API_KEY", ""))
 
-app = FastAPI()
+def warm_up_libreoffice_pool(pool):
+    try:
+        pool.start()
+    except RuntimeError as e:
+        # PDF conversions fall back to one-shot LibreOffice processes
+        print(f"LibreOffice pool warm-up failed: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up the LibreOffice worker pool in the background so the first PDF download is fast
+    pool = get_libreoffice_pool()
+    if pool is not None:
+        threading.Thread(target=warm_up_libreoffice_pool, args=(pool,), daemon=True).start()
+    # Sweep scratch directories left by a previous crash
+    clean_scratch_root()
+    # Parse and index the Word template once, before the first download
+    if os.path.exists(TEMPLATE_PATH):
+        get_compiled_template()
+    yield
+    await close_client()
+    render_pool.shutdown()
+    shutdown_libreoffice_pool()
+    db.close_pools()
+
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -31,12 +69,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_timing(request: Request, call_next):
+    """
+    Time each request as stage "http" (by route) and, with SERVER_TIMING=1, add a
+    Server-Timing header with its stages. For streamed responses both cover the
+    work done until the response starts.
+    """
+    with collect_spans() as spans:
+        started = time.perf_counter()
+        response = await call_next(request)
+        route = request.scope.get("route")
+        record_span("http", f"{request.method} {route.path if route else 'unmatched'}", time.perf_counter() - started)
+        if SERVER_TIMING:
+            response.headers["Server-Timing"] = server_timing_header(spans)
+    return response
+
 # Serve static files (generated resumes)
 app.mount("/static", StaticFiles(directory="backend/tmp"), name="static")
 
-# In-memory storage for generated resumes
-generated_resumes_db: Dict[str, Resume] = {}
-
 # --- Resume Template (fixed fields only - content is generated by AI) ---
 BASE_USER_RESUME = Resume(
     name="MAHIM MITTAL",
@@ -86,65 +137,184 @@ class GenerateResumeRequest(BaseModel):
     job_description_text: str
     desired_filename_job_title: str
     job_link: Optional[str] = None
+    regenerate: bool = False  # Skip the LLM cache and ask OpenAI for a fresh resume
 
-@app.post("/generate_tailored_resume/", response_model=Dict)
-async def generate_tailored_resume(request: GenerateResumeRequest):
-    job_description_text = request.job_description_text
-
+def job_description_from_text(job_description_text: str) -> JobDescription:
     # Create a dummy JobDescription for tailoring (OpenAI will use its description)
-    dummy_job_description = JobDescription(
+    return JobDescription(
         title="placeholder", 
         company="placeholder",
         description=job_description_text,
         keywords=[]
     )
-    
-    # Tailor resume using OpenAI
-    tailored_resume = tailor_resume(BASE_USER_RESUME, dummy_job_description)
-    
-    # Store the tailored resume with a unique ID
+
+def store_tailored_resume(request: GenerateResumeRequest, tailored_resume: Resume) -> str:
+    """Save a tailored resume to history and keep it cached for downloads. Returns its ID."""
     resume_id = str(uuid.uuid4())
-    generated_resumes_db[resume_id] = tailored_resume
-    
-    # Save to database for history
-    db.save_resume(
+    resume_cache.save(
         resume_id=resume_id,
         job_title=request.desired_filename_job_title,
-        job_description=job_description_text,
-        resume_data=tailored_resume.model_dump(),
+        job_description=request.job_description_text,
+        resume=tailored_resume,
         job_link=request.job_link
     )
+    if EAGER_PRERENDER:
+        schedule_prerender(tailored_resume)
+    return resume_id
+
+@app.post("/generate_tailored_resume/", response_model=Dict)
+async def generate_tailored_resume(request: GenerateResumeRequest):
+    # Tailor resume using OpenAI
+    tailored_resume = await tailor_resume(BASE_USER_RESUME, job_description_from_text(request.job_description_text), use_cache=not request.regenerate)
+    
+    # Store the tailored resume with a unique ID
+    resume_id = store_tailored_resume(request, tailored_resume)
 
     return {"resume_id": resume_id, "resume_data": tailored_resume.model_dump()}
 
+@app.post("/generate_tailored_resume/stream")
+async def generate_tailored_resume_stream(request: GenerateResumeRequest):
+    """
+    Stream the tailored resume as Server-Sent Events:
+    "section" (summary, skills, certifications) and "experience" events as each part
+    is complete, then "done" with the resume_id and full resume, or "error".
+    """
+    async def event_stream():
+        try:
+            async for kind, payload in stream_tailor_resume(BASE_USER_RESUME, job_description_from_text(request.job_description_text), use_cache=not request.regenerate):
+                if kind == "resume":
+                    resume_id = store_tailored_resume(request, payload)
+                    yield format_sse("done", {"resume_id": resume_id, "resume_data": payload.model_dump()})
+                else:
+                    yield format_sse(kind, payload)
+        except Exception as e:
+            print(f"Error streaming tailored resume: {e}")
+            yield format_sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+class BatchGenerateRequest(BaseModel):
+    items: List[GenerateResumeRequest]
+    prerender: bool = False  # Also render DOCX and PDF for each resume in the background
+
+@app.post("/generate_tailored_resume/batch", status_code=202)
+async def generate_tailored_resume_batch(request: BatchGenerateRequest):
+    """Start tailoring many job descriptions concurrently. Poll /batch_jobs/{job_id} for results."""
+    if not request.items:
+        raise HTTPException(status_code=400, detail="Batch has no items")
+
+    async def tailor(item: GenerateResumeRequest) -> Resume:
+        return await request_tailored_resume(BASE_USER_RESUME, job_description_from_text(item.job_description_text), use_cache=not item.regenerate)
+
+    job = batch.create_batch_job(request.items, prerender=request.prerender)
+    job.task = asyncio.create_task(batch.run_batch_job(job, tailor, resume_cache.save_many, prerender))
+    return job.to_dict()
+
+@app.get("/batch_jobs/{job_id}")
+async def get_batch_job(job_id: str):
+    """Per-item status of a batch tailoring job."""
+    state = batch.get_batch_job_state(job_id)
+    if not state:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return state
+
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+async def render_download(resume: Resume, fmt: str) -> bytes:
+    """Render for a download, answering 503 when the render queue is full."""
+    try:
+        return await render_document(resume, fmt)
+    except RenderQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+def document_response(content: bytes, filename: str, media_type: str) -> StreamingResponse:
+    """Stream an in-memory document as an attachment."""
+    def chunks():
+        view = memoryview(content)
+        for start in range(0, len(view), DOWNLOAD_CHUNK_SIZE):
+            yield view[start:start + DOWNLOAD_CHUNK_SIZE]
+
+    quoted = quote(filename)
+    if quoted != filename:
+        disposition = f"attachment; filename*=utf-8''{quoted}"
+    else:
+        disposition = f'attachment; filename="{filename}"'
+    return StreamingResponse(
+        chunks(),
+        media_type=media_type,
+        headers={"Content-Length": str(len(content)), "Content-Disposition": disposition}
+    )
 
 @app.get("/download_resume/pdf/{resume_id}/{desired_filename_job_title:path}")
 async def download_resume_pdf(resume_id: str, desired_filename_job_title: str):
-    if resume_id not in generated_resumes_db:
+    resume_to_download = resume_cache.get(resume_id)
+    if resume_to_download is None:
         raise HTTPException(status_code=404, detail="Generated resume not found")
-
-    resume_to_download = generated_resumes_db[resume_id]
     
     # Use timestamp for professional-looking filename (like Google Docs exports)
     timestamp = int(time.time() * 1000)
     filename = f"{resume_to_download.name}-resume-{timestamp}.pdf"
 
-    pdf_path = generate_pdf_resume(resume_to_download)
-    return FileResponse(path=pdf_path, media_type="application/pdf", filename=filename)
+    pdf = await render_download(resume_to_download, "pdf")
+    return document_response(pdf, filename, "application/pdf")
 
 @app.get("/download_resume/word/{resume_id}/{desired_filename_job_title:path}")
 async def download_resume_word(resume_id: str, desired_filename_job_title: str):
-    if resume_id not in generated_resumes_db:
+    resume_to_download = resume_cache.get(resume_id)
+    if resume_to_download is None:
         raise HTTPException(status_code=404, detail="Generated resume not found")
 
-    resume_to_download = generated_resumes_db[resume_id]
-
     # Use timestamp for professional-looking filename (like Google Docs exports)
     timestamp = int(time.time() * 1000)
     filename = f"{resume_to_download.name}-resume-{timestamp}.docx"
 
-    word_path = generate_word_resume(resume_to_download)
-    return FileResponse(path=word_path, media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document", filename=filename)
+    docx = await render_download(resume_to_download, "docx")
+    return document_response(docx, filename, DOCX_MEDIA_TYPE)
+
+@app.get("/render_status/{resume_id}")
+async def get_render_status(resume_id: str):
+    """Whether the DOCX and PDF downloads of a resume are ready, still rendering, or failed."""
+    resume = resume_cache.get(resume_id)
+    if resume is None:
+        raise HTTPException(status_code=404, detail="Generated resume not found")
+    return {"resume_id": resume_id, "formats": render_status(resume)}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Stage timings, stage failures and OpenAI token usage of this worker, in the Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/cache/render/stats")
+async def get_render_cache_stats():
+    """Hit/miss statistics for the rendered document cache."""
+    return render_cache.stats()
+
+@app.get("/render/stats")
+async def get_render_pool_stats():
+    """Queue depth, rejections and per-format queue/render timings of the render pool."""
+    return render_pool.stats()
+
+@app.get("/single_flight/stats")
+async def get_single_flight_stats():
+    """How many identical in-flight tailoring and render requests were coalesced."""
+    return {"tailor": tailor_flight.stats(), "render": render_flight.stats()}
+
+@app.get("/cache/resumes/stats")
+async def get_resume_cache_stats():
+    """Hit rate, evictions and approximate memory use of the in-memory resume cache."""
+    return resume_cache.stats()
+
+@app.get("/cache/llm/stats")
+async def get_llm_cache_stats():
+    """Hit/miss statistics for the cached OpenAI tailoring completions."""
+    return llm_cache.get_cache_stats()
 
 
 # =============================================================================
@@ -152,9 +322,25 @@ async def download_resume_word(resume_id: str, desired_filename_job_title: str):
 # =============================================================================
 
 @app.get("/history/")
-async def get_resume_history():
-    """Get all previously generated resumes."""
-    return db.get_all_resumes()
+async def get_resume_history(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    preview_chars: int = Query(0, ge=0, le=2000)
+):
+    """Get a page of previously generated resumes, newest first. Pass next_cursor back as cursor for the next page."""
+    try:
+        return db.get_resumes_page(limit=limit, cursor=cursor, preview_chars=preview_chars)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/history/search")
+async def search_resume_history(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0)
+):
+    """Full-text search over saved resumes, ranked, with highlighted snippets."""
+    return db.search_resumes(q, limit=limit, offset=offset)
 
 @app.get("/history/{resume_id}")
 async def get_resume_from_history(resume_id: str):
@@ -163,25 +349,70 @@ async def get_resume_from_history(resume_id: str):
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found in history")
     
-    # Also load into memory for downloads
-    resume_data = resume["resume_data"]
-    generated_resumes_db[resume_id] = Resume(**resume_data)
+    # Also cache for the downloads that usually follow
+    resume_cache.put(resume_id, Resume(**resume["resume_data"]), db.resume_data_version(resume["resume_data"]))
     
     return resume
 
 @app.delete("/history/{resume_id}")
 async def delete_resume_from_history(resume_id: str):
     """Delete a resume from history."""
-    success = db.delete_resume(resume_id)
+    success = resume_cache.delete(resume_id)
     if not success:
         raise HTTPException(status_code=404, detail="Resume not found")
     
-    # Also remove from memory
-    if resume_id in generated_resumes_db:
-        del generated_resumes_db[resume_id]
-    
     return {"message": "Resume deleted successfully"}
 
+@app.get("/history/{resume_id}/validation")
+async def validate_resume_from_history(resume_id: str):
+    """Check a stored resume against the summary and bullet length rules (no model call)."""
+    resume = resume_cache.get(resume_id)
+    if resume is None:
+        raise HTTPException(status_code=404, detail="Resume not found in history")
+    return validate_resume(resume)
+
+class RegenerateSectionsRequest(BaseModel):
+    fields: List[str] = []  # Any of "summary", "skills", "certifications"
+    experience: List[int] = []  # Indexes into the resume's experience list
+
+@app.post("/history/{resume_id}/regenerate")
+async def regenerate_resume_sections(resume_id: str, request: RegenerateSectionsRequest):
+    """Regenerate only the selected sections of a stored resume and save it in place."""
+    stored = db.get_resume(resume_id)
+    if not stored:
+        raise HTTPException(status_code=404, detail="Resume not found in history")
+    current = Resume(**stored["resume_data"])
+
+    unknown = [field for field in request.fields if field not in STREAMED_SECTIONS]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown fields: {', '.join(unknown)}")
+    experience_indexes = sorted(set(request.experience))
+    if any(index < 0 or index >= len(current.experience) for index in experience_indexes):
+        raise HTTPException(status_code=422, detail="Experience index out of range")
+    # Company and dates of a regenerated entry come from the base resume
+    if any(index >= len(BASE_USER_RESUME.experience) for index in experience_indexes):
+        raise HTTPException(status_code=422, detail="Experience entries beyond the base resume cannot be regenerated")
+    if not request.fields and not experience_indexes:
+        raise HTTPException(status_code=422, detail="Nothing to regenerate")
+    if not (stored["job_description"] or "").strip():
+        raise HTTPException(status_code=409, detail="Resume has no stored job description to regenerate against")
+
+    try:
+        job_description = job_description_from_text(stored["job_description"])
+        updated = await regenerate_sections(BASE_USER_RESUME, current, job_description, request.fields, experience_indexes)
+    except Exception as e:
+        print(f"Error regenerating sections of {resume_id}: {e}")
+        raise HTTPException(status_code=502, detail="Could not regenerate sections")
+
+    if not resume_cache.update(resume_id, updated):
+        raise HTTPException(status_code=404, detail="Resume not found in history")
+    # Renders of the old content are stale; the new content gets its own entries
+    render_cache.invalidate(current)
+    if EAGER_PRERENDER:
+        schedule_prerender(updated)
+
+    return {"resume_id": resume_id, "resume_data": updated.model_dump()}
+
 
 # =============================================================================
 # CHAT ENDPOINTS
@@ -195,69 +426,78 @@ class ChatRequest(BaseModel):
 async def chat_about_resume(request: ChatRequest):
     """Ask questions about a generated resume."""
     # Get resume from memory or database
-    if request.resume_id in generated_resumes_db:
-        resume = generated_resumes_db[request.resume_id]
-        resume_data = resume.model_dump()
-    else:
-        stored = db.get_resume(request.resume_id)
-        if not stored:
-            raise HTTPException(status_code=404, detail="Resume not found")
-        resume_data = stored["resume_data"]
-    
-    # Get chat history
-    chat_history = db.get_chat_history(request.resume_id)
-    
-    # Build messages for OpenAI
-    messages = [
-        {
-            "role": "system", 
-            "content": f"""You are a helpful assistant that answers questions about the following resume. 
-            Be specific and reference actual content from the resume when answering.
-            
-            RESUME DATA:
-            {resume_data}
-            """
-        }
-    ]
-    
-    # Add chat history
-    for msg in chat_history:
-        messages.append({"role": msg["role"], "content": msg["content"]})
+    resume = resume_cache.get(request.resume_id)
+    if resume is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
     
-    # Add current message
-    messages.append({"role": "user", "content": request.message})
+    # Resume, rolling summary of older turns and the newest turns, within the token budget
+    messages = build_chat_messages(request.resume_id, resume, request.message)
     
     # Get response from OpenAI
     try:
-        response = openai.chat.completions.create(
-            model="gpt-4o-mini",
+        response = await chat_completion(
+            model=CHAT_MODEL,
             messages=messages
         )
         assistant_response = response.choices[0].message.content
         
-        # Save chat messages to database
-        db.save_chat_message(request.resume_id, "user", request.message)
-        db.save_chat_message(request.resume_id, "assistant", assistant_response)
+        # Save both messages of the turn together
+        message = db.save_chat_messages(request.resume_id, [
+            {"role": "user", "content": request.message},
+            {"role": "assistant", "content": assistant_response},
+        ])[-1]
+        schedule_chat_compaction(request.resume_id)
         
-        return {
-            "response": assistant_response,
-            "chat_history": db.get_chat_history(request.resume_id)
-        }
+        return {"response": assistant_response, "message": message}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Chat error: {str(e)}")
 
+@app.post("/chat/stream")
+async def chat_about_resume_stream(request: ChatRequest):
+    """
+    Stream the answer as Server-Sent Events: "token" events with content deltas
+    as they arrive, then "done" with the new assistant message once the turn is
+    saved, or "error". A turn cut off before the end is not saved.
+    """
+    resume = resume_cache.get(request.resume_id)
+    if resume is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    messages = build_chat_messages(request.resume_id, resume, request.message)
+
+    async def event_stream():
+        parts = []
+        try:
+            async for delta in stream_chat_completion(model=CHAT_MODEL, messages=messages):
+                parts.append(delta)
+                yield format_sse("token", {"content": delta})
+            message = db.save_chat_messages(request.resume_id, [
+                {"role": "user", "content": request.message},
+                {"role": "assistant", "content": "".join(parts)},
+            ])[-1]
+            schedule_chat_compaction(request.resume_id)
+            yield format_sse("done", {"message": message})
+        except Exception as e:
+            print(f"Error streaming chat response: {e}")
+            yield format_sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/chat/{resume_id}")
-async def get_chat_history(resume_id: str):
-    """Get chat history for a resume."""
-    return db.get_chat_history(resume_id)
+async def get_chat_history(
+    resume_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    before: Optional[int] = None
+):
+    """Get a page of chat history for a resume, oldest first. Pass next_before back as before for older messages."""
+    return db.get_chat_history_page(resume_id, limit=limit, before=before)
 
 @app.delete("/chat/{resume_id}")
 async def clear_chat_history(resume_id: str):
     """Clear chat history for a resume (keeps resume)."""
-    conn = __import__('sqlite3').connect(db.DATABASE_PATH)
-    cursor = conn.cursor()
-    cursor.execute('DELETE FROM chat_history WHERE resume_id = ?', (resume_id,))
-    conn.commit()
-    conn.close()
+    db.clear_chat_history(resume_id)
     return {"message": "Chat history cleared"}
 
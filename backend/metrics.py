@@ -0,0 +1,161 @@
+import asyncio
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# =============================================================================
+# METRICS CONFIGURATION - Override with environment variables
+# =============================================================================
+
+METRICS_PREFIX = "apexdocs"
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "0") == "1"  # Add a Server-Timing header with the stages of each request
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)  # Seconds
+
+# One timed piece of work: (stage, name, seconds, failed)
+Span = Tuple[str, str, float, bool]
+
+# Spans of the request being handled, when something collects them (Server-Timing, render workers)
+_current_spans: ContextVar[Optional[List[Span]]] = ContextVar("current_spans", default=None)
+
+
+class MetricsRegistry:
+    """
+    Per-process stage timings (a histogram per stage and name), stage failures
+    and OpenAI token usage, rendered in the Prometheus text format. Like the
+    other stats, every uvicorn worker keeps its own.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = STAGE_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], List[float]] = {}  # bucket counts..., sum, count
+        self._errors: Dict[Tuple[str, str], int] = {}
+        self._tokens: Dict[Tuple[str, str], int] = {}
+
+    def observe(self, stage: str, name: str, seconds: float, failed: bool = False):
+        with self._lock:
+            histogram = self._histograms.get((stage, name))
+            if histogram is None:
+                histogram = self._histograms[(stage, name)] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram[i] += 1
+            histogram[-2] += seconds
+            histogram[-1] += 1
+            if failed:
+                self._errors[(stage, name)] = self._errors.get((stage, name), 0) + 1
+
+    def count_tokens(self, model: str, prompt_tokens: int, completion_tokens: int):
+        with self._lock:
+            for kind, tokens in (("prompt", prompt_tokens), ("completion", completion_tokens)):
+                self._tokens[(model, kind)] = self._tokens.get((model, kind), 0) + tokens
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        duration = f"{METRICS_PREFIX}_stage_duration_seconds"
+        errors = f"{METRICS_PREFIX}_stage_errors_total"
+        tokens = f"{METRICS_PREFIX}_openai_tokens_total"
+        lines = [
+            f"# HELP {duration} Time spent per stage (http, openai, parse, db, render, template, pdf_convert, ...).",
+            f"# TYPE {duration} histogram",
+        ]
+        with self._lock:
+            for (stage, name), histogram in sorted(self._histograms.items()):
+                labels = f'stage="{_escape(stage)}",name="{_escape(name)}"'
+                for bound, count in zip(self.buckets, histogram):
+                    lines.append(f'{duration}_bucket{{{labels},le="{bound}"}} {count:.0f}')
+                lines.append(f'{duration}_bucket{{{labels},le="+Inf"}} {histogram[-1]:.0f}')
+                lines.append(f"{duration}_sum{{{labels}}} {histogram[-2]}")
+                lines.append(f"{duration}_count{{{labels}}} {histogram[-1]:.0f}")
+
+            lines += [f"# HELP {errors} Stage runs that raised.", f"# TYPE {errors} counter"]
+            for (stage, name), count in sorted(self._errors.items()):
+                lines.append(f'{errors}{{stage="{_escape(stage)}",name="{_escape(name)}"}} {count}')
+
+            lines += [f"# HELP {tokens} OpenAI tokens used, by model and kind (prompt, completion).", f"# TYPE {tokens} counter"]
+            for (model, kind), count in sorted(self._tokens.items()):
+                lines.append(f'{tokens}{{model="{_escape(model)}",kind="{kind}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = MetricsRegistry()
+
+
+def record_span(stage: str, name: str, seconds: float, failed: bool = False):
+    """Record a stage timing in the registry and in the current request's spans."""
+    metrics.observe(stage, name, seconds, failed)
+    spans = _current_spans.get()
+    if spans is not None:
+        spans.append((stage, name, seconds, failed))
+
+
+@contextmanager
+def span(stage: str, name: str = ""):
+    """Time the enclosed block (sync or async code) as one run of stage/name."""
+    started = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except (GeneratorExit, asyncio.CancelledError):
+        raise  # The caller went away; not a failure of the stage
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        record_span(stage, name, time.perf_counter() - started, failed)
+
+
+def timed(stage: str):
+    """Decorator timing every call of a (sync) function as stage/<function name>."""
+    def decorate(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(stage, function.__name__):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def collect_spans() -> Iterator[List[Span]]:
+    """Collect the spans recorded in the enclosed block (and tasks or threads started from it)."""
+    spans: List[Span] = []
+    token = _current_spans.set(spans)
+    try:
+        yield spans
+    finally:
+        _current_spans.reset(token)
+
+
+def absorb_spans(spans: List[Span], observe: bool = True):
+    """
+    Add spans recorded elsewhere (e.g. in a render pool process) to the current
+    request, and to this process's registry unless they were already observed here.
+    """
+    current = _current_spans.get()
+    for stage, name, seconds, failed in spans:
+        if observe:
+            metrics.observe(stage, name, seconds, failed)
+        if current is not None:
+            current.append((stage, name, seconds, failed))
+
+
+def server_timing_header(spans: List[Span]) -> str:
+    """Server-Timing value with the total time and number of runs of each stage, in first-seen order."""
+    totals: Dict[str, List[Any]] = {}
+    for stage, _, seconds, _ in spans:
+        total = totals.setdefault(stage, [0.0, 0])
+        total[0] += seconds
+        total[1] += 1
+    return ", ".join(
+        f'{stage};dur={seconds * 1000:.1f};desc="{count} run{"s" if count != 1 else ""}"'
+        for stage, (seconds, count) in totals.items()
+    )
@@ -0,0 +1,126 @@
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Optional
+import httpx
+import openai
+from .metrics import metrics, record_span, span
+
+# =============================================================================
+# OPENAI CLIENT CONFIGURATION - Override with environment variables
+# =============================================================================
+
+OPENAI_TIMEOUT = float(os.environ.get("OPENAI_TIMEOUT", "120"))  # Seconds per request (gpt-4o resumes take 10-40 s)
+OPENAI_CONNECT_TIMEOUT = float(os.environ.get("OPENAI_CONNECT_TIMEOUT", "10"))
+OPENAI_MAX_RETRIES = int(os.environ.get("OPENAI_MAX_RETRIES", "2"))
+OPENAI_MAX_CONNECTIONS = int(os.environ.get("OPENAI_MAX_CONNECTIONS", "32"))  # HTTP connection pool size
+OPENAI_MAX_CONCURRENCY = int(os.environ.get("OPENAI_MAX_CONCURRENCY", "16"))  # In-flight completions per process
+RATE_LIMIT_COMPLETION_TOKENS = 3000  # Output tokens assumed for a completion without max_tokens (a whole resume)
+
+_client: Optional[openai.AsyncOpenAI] = None
+_semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+# Rate limiter charged for every completion started in the current context (batch jobs), if any
+_rate_limiter: ContextVar[Optional[Any]] = ContextVar("openai_rate_limiter", default=None)
+
+
+def get_client() -> openai.AsyncOpenAI:
+    """
+    Shared AsyncOpenAI client. Created on first use so OPENAI_API_KEY loaded
+    from .env in main.py is picked up, then reused so connections stay pooled.
+    """
+    global _client
+    if _client is None:
+        _client = openai.AsyncOpenAI(
+            timeout=openai.Timeout(OPENAI_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT),
+            max_retries=OPENAI_MAX_RETRIES,
+            http_client=openai.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=OPENAI_MAX_CONNECTIONS,
+                    max_keepalive_connections=OPENAI_MAX_CONNECTIONS,
+                )
+            ),
+        )
+    return _client
+
+
+@contextmanager
+def rate_limited(limiter):
+    """
+    Charge every completion started in the enclosed block (and tasks started
+    from it) to limiter, which has an async acquire(tokens) taking one request.
+    """
+    token = _rate_limiter.set(limiter)
+    try:
+        yield
+    finally:
+        _rate_limiter.reset(token)
+
+
+def estimate_request_tokens(kwargs: Dict[str, Any]) -> int:
+    """Prompt (about 4 characters per token) plus expected output tokens of one completion."""
+    prompt = sum(len(message.get("content") or "") for message in kwargs.get("messages", [])) // 4 + 1
+    return prompt + kwargs.get("max_tokens", RATE_LIMIT_COMPLETION_TOKENS)
+
+
+async def _acquire(kwargs: Dict[str, Any], model: str):
+    limiter = _rate_limiter.get()
+    with span("openai_wait", model):
+        if limiter is not None:
+            await limiter.acquire(estimate_request_tokens(kwargs))
+        await _semaphore.acquire()
+
+
+async def chat_completion(**kwargs):
+    """
+    Await a chat completion without blocking the event loop. At most
+    OPENAI_MAX_CONCURRENCY completions run at once; the rest queue here.
+    """
+    model = kwargs.get("model", "")
+    await _acquire(kwargs, model)
+    try:
+        with span("openai", model):
+            response = await get_client().chat.completions.create(**kwargs)
+    finally:
+        _semaphore.release()
+    _count_usage(model, getattr(response, "usage", None))
+    return response
+
+
+async def stream_chat_completion(**kwargs) -> AsyncIterator[str]:
+    """
+    Stream a chat completion, yielding content deltas as they arrive.
+    Holds a concurrency slot until the stream is finished.
+    """
+    model = kwargs.get("model", "")
+    await _acquire(kwargs, model)
+    try:
+        with span("openai", model):
+            started = time.perf_counter()
+            first_token = True
+            stream = await get_client().chat.completions.create(
+                stream=True, stream_options={"include_usage": True}, **kwargs
+            )
+            async for chunk in stream:
+                # With include_usage the last chunk has no choices, only the token counts
+                _count_usage(model, getattr(chunk, "usage", None))
+                if chunk.choices and chunk.choices[0].delta.content:
+                    if first_token:
+                        record_span("openai_first_token", model, time.perf_counter() - started)
+                        first_token = False
+                    yield chunk.choices[0].delta.content
+    finally:
+        _semaphore.release()
+
+
+def _count_usage(model: str, usage):
+    if usage is not None:
+        metrics.count_tokens(model, usage.prompt_tokens or 0, usage.completion_tokens or 0)
+
+
+async def close_client():
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -1,9 +1,41 @@
-import openai
+import asyncio
 import json
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-from .models import Resume, JobDescription
+from .models import Resume, Experience, JobDescription
+from .openai_client import chat_completion, stream_chat_completion
+from .json_stream import IncrementalJSONParser
+from .single_flight import SingleFlight
+from .metrics import span
+from .resume_validator import validate_resume, experience_level, SUMMARY_MIN_WORDS
+from .utils import process_bullet_points
+from . import llm_cache
 
-def tailor_resume(original_resume: Resume, job_description: JobDescription) -> Resume:
+TAILOR_MODEL = "gpt-4o"
+TAILOR_PROMPT_VERSION = "1"  # Bump whenever the prompt changes so cached completions are not reused
+TAILOR_SYSTEM_PROMPT = "You are an expert resume writer. CRITICAL: Write LONG, DETAILED bullets. Summary: 75+ words. MINIMUM bullet lengths - Senior: 28+ words, Mid: 22+ words, Junior: 16+ words. SHORT BULLETS ARE REJECTED. Each bullet needs: action verb + context + tools/tech + metric + business impact. Example Senior bullet (30 words): 'Architected and deployed high-performance data systems using Kafka and Spark with advanced caching strategies, processing 2M daily transactions while reducing latency by 65% and cutting infrastructure costs by $50K annually'. Output valid JSON."
+
+# Generated sections pushed to the client as soon as they are complete while streaming
+STREAMED_SECTIONS = ("summary", "skills", "certifications")
+
+# Tailoring requests in flight, keyed by the LLM cache key (normalized job description)
+tailor_flight = SingleFlight()
+
+# Tailoring mode:
+# "single" - the whole resume in one completion (default)
+# "fanout" - one shared job description analysis, then summary/skills/certifications and
+#            each experience entry as concurrent smaller completions, merged into a Resume.
+#            Lower latency, but 2 + one per experience entry completions, each with the job description
+TAILOR_MODE = os.environ.get("TAILOR_MODE", "single")
+ANALYSIS_MODEL = "gpt-4o-mini"
+ANALYSIS_PROMPT_VERSION = "1"  # Bump whenever the analysis prompt changes
+
+# Check generated resumes against the length rules and re-ask only for what fails
+TAILOR_REPAIR = os.environ.get("TAILOR_REPAIR", "1") == "1"
+REPAIR_CONTEXT_CHARS = 2000  # Job description excerpt sent with repair requests
+
+def build_tailor_messages(original_resume: Resume, job_description: JobDescription) -> List[Dict[str, str]]:
 
     # Convert resume and job description to text for OpenAI
     original_resume_text = original_resume.model_dump_json(indent=2)
@@ -67,42 +99,431 @@ def tailor_resume(original_resume: Resume, job_description: JobDescription) -> R
     Return valid JSON matching the template resume schema.
     """
 
+    return [
+        {"role": "system", "content": TAILOR_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+def build_analysis_messages(job_description: JobDescription) -> List[Dict[str, str]]:
+    prompt = f"""
+    Analyze the Job Description below for writing a tailored resume. Return JSON with:
+    - "target_role": the role being hired for
+    - "titles": {{"Senior": ..., "Mid": ..., "Junior": ...}} job titles at three seniority levels matching the target role
+      (e.g. "Senior [Role]", "[Role]", "Junior [Role]" or "Associate [Role]"); never "Business Analyst" unless it is a BA role
+    - "key_skills": the 20-30 most important skills, tools and technologies, most important first
+    - "keywords": industry keywords and phrases a recruiter would search for
+    - "certifications": certifications mentioned as required or preferred (empty list if none)
+    - "responsibilities": the main responsibilities of the role, in short phrases
+
+    Job Description:\n{job_description.description}
+    """
+    return [
+        {"role": "system", "content": "You analyze job descriptions for resume writers. Output valid JSON."},
+        {"role": "user", "content": prompt}
+    ]
+
+def _analysis_text(analysis: Dict[str, Any]) -> str:
+    return json.dumps(analysis, indent=2)
+
+# Instructions and JSON shape of each overview field
+OVERVIEW_FIELD_RULES = {
+    "summary": ("""**SUMMARY** - Write a professional summary (MINIMUM 75 words):
+       - MUST start with "8+ years of experience"
+       - Matches the target role from the job description
+       - Highlights relevant expertise, key skills, and achievements for THIS specific job
+       - Include industry keywords from the job description""", '"summary": "..."'),
+    "skills": ("""**SKILLS** - Generate skills from the job description:
+       - Group into 3-5 categories: "Category Name: skill1, skill2, skill3, ..."
+       - Each category: 6-7 relevant skills
+       - Prioritize skills mentioned in the job description""", '"skills": ["Category: ...", ...]'),
+    "certifications": ("""**CERTIFICATIONS** - Generate 1 or 2 relevant certifications:
+       - Must match the target role/industry
+       - Include any certifications mentioned in job description as required/preferred""", '"certifications": ["...", ...]'),
+}
+
+def build_overview_messages(original_resume: Resume, job_description: JobDescription, analysis: Dict[str, Any],
+                            fields: Tuple[str, ...] = STREAMED_SECTIONS) -> List[Dict[str, str]]:
+    rules = "\n\n    ".join(f"{i}. {OVERVIEW_FIELD_RULES[field][0]}" for i, field in enumerate(fields, start=1))
+    shape = ", ".join(OVERVIEW_FIELD_RULES[field][1] for field in fields)
+    prompt = f"""
+    Write the {", ".join(fields)} of a resume for the Job Description below.
+
+    {rules}
+
+    Education (for context):\n{json.dumps([edu.model_dump() for edu in original_resume.education])}
+
+    Job Description Analysis:\n{_analysis_text(analysis)}
+
+    Job Description:\n{job_description.description}
+
+    Return JSON: {{{shape}}}
+    """
+    return [
+        {"role": "system", "content": TAILOR_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+def build_experience_messages(original_resume: Resume, job_description: JobDescription, analysis: Dict[str, Any], index: int) -> List[Dict[str, str]]:
+    experience = original_resume.experience[index]
+    level, bullets, min_words = experience_level(index)
+    title = analysis.get("titles", {}).get(level, "")
+    prompt = f"""
+    Write one experience entry of a resume for the Job Description below.
+
+    Company: {experience.company} ({experience.start_date} - {experience.end_date or 'Present'})
+    Level: {level}{f' (suggested title: "{title}")' if title else ''}
+
+    - "title": a {level} level job title matching the target role
+    - "description": EXACTLY {bullets} bullets separated by PIPE "|" (no newlines)
+    - MANDATORY: every bullet has at least {min_words} words (COUNT YOUR WORDS!)
+    - EACH BULLET MUST INCLUDE: action verb + specific context + technology/tools + quantified result + business impact
+    - Use the key skills and responsibilities from the analysis; do not repeat the same achievement twice
+
+    Job Description Analysis:\n{_analysis_text(analysis)}
+
+    Job Description:\n{job_description.description}
+
+    Return JSON: {{"title": "...", "description": "bullet | bullet | ..."}}
+    """
+    return [
+        {"role": "system", "content": TAILOR_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+def build_summary_repair_messages(summary: str, job_description: JobDescription) -> List[Dict[str, str]]:
+    prompt = f"""
+    This resume summary has {len(summary.split())} words; it MUST have at least {SUMMARY_MIN_WORDS}.
+    Expand it with relevant expertise, key skills and achievements for the job below, keeping what it says.
+    It MUST start with "8+ years of experience".
+
+    Summary:\n{summary}
+
+    Job Description (excerpt):\n{job_description.description[:REPAIR_CONTEXT_CHARS]}
+
+    Return JSON: {{"summary": "..."}}
+    """
+    return [
+        {"role": "system", "content": TAILOR_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+def build_bullet_repair_messages(experience: Experience, index: int, bullets: List[str], short: List[int],
+                                 missing: int, job_description: JobDescription) -> List[Dict[str, str]]:
+    level, _, min_words = experience_level(index)
+    parts = []
+    if short:
+        listed = "\n".join(f"{i}. {bullets[position]}" for i, position in enumerate(short, start=1))
+        parts.append(f"""These bullets are too short. Rewrite each one to AT LEAST {min_words} words, keeping its
+    achievement and metrics and adding context, tools and business impact:\n{listed}""")
+    if missing:
+        existing = "\n".join(f"- {bullet}" for bullet in bullets)
+        parts.append(f"""Write {missing} NEW bullets of AT LEAST {min_words} words each, different from the existing ones:\n{existing}""")
+    instructions = "\n\n    ".join(parts)
+    prompt = f"""
+    Fix the bullets of the {level} level role "{experience.title}" at {experience.company}.
+    EACH BULLET MUST INCLUDE: action verb + specific context + technology/tools + quantified result + business impact
+
+    {instructions}
+
+    Job Description (excerpt):\n{job_description.description[:REPAIR_CONTEXT_CHARS]}
+
+    Return JSON: {{"rewritten": [one per bullet to rewrite, same order], "new": [new bullets]}}
+    """
+    return [
+        {"role": "system", "content": TAILOR_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+def enforce_experience_fixed_fields(original_resume: Resume, index: int, experience: Experience) -> Experience:
+    """Restore company and employment dates of one experience entry from the template."""
+    if index < len(original_resume.experience):
+        experience.company = original_resume.experience[index].company
+        experience.start_date = original_resume.experience[index].start_date
+        experience.end_date = original_resume.experience[index].end_date
+    return experience
+
+def enforce_fixed_fields(original_resume: Resume, tailored_resume_data: Dict[str, Any]) -> Resume:
+    """Build a Resume from OpenAI output, keeping the template's fixed fields."""
+    # Ensure fixed fields are truly fixed after OpenAI processing
+    final_resume = Resume(**tailored_resume_data)
+    final_resume.name = original_resume.name
+    final_resume.email = original_resume.email
+    final_resume.phone = original_resume.phone
+    final_resume.linkedin = original_resume.linkedin
+    final_resume.github = original_resume.github
+    final_resume.location = original_resume.location
+
+    # Ensure company, start_date, end_date for experience, and all education fields are fixed
+    if len(original_resume.experience) == len(final_resume.experience):
+        for i in range(len(original_resume.experience)):
+            enforce_experience_fixed_fields(original_resume, i, final_resume.experience[i])
+    
+    if len(original_resume.education) == len(final_resume.education):
+        for i in range(len(original_resume.education)):
+            final_resume.education[i].degree = original_resume.education[i].degree
+            final_resume.education[i].major = original_resume.education[i].major
+            final_resume.education[i].university = original_resume.education[i].university
+            final_resume.education[i].graduation_date = original_resume.education[i].graduation_date
+
+    return final_resume
+
+def parse_tailored_resume(original_resume: Resume, content: str) -> Resume:
+    """Parse and validate a tailoring completion (or cached copy) into a Resume."""
+    with span("parse", "resume"):
+        return enforce_fixed_fields(original_resume, json.loads(content))
+
+def tailor_cache_key(original_resume: Resume, job_description: JobDescription) -> str:
+    # Fan-out results are merged from different prompts, so they are cached separately
+    prompt_version = TAILOR_PROMPT_VERSION if TAILOR_MODE == "single" else f"{TAILOR_PROMPT_VERSION}-{TAILOR_MODE}"
+    return llm_cache.make_cache_key(
+        job_description.description,
+        original_resume.model_dump_json(),
+        prompt_version,
+        TAILOR_MODEL
+    )
+
+def lookup_cached_completion(original_resume: Resume, job_description: JobDescription, use_cache: bool) -> Optional[str]:
+    """Cached completion text for this request, unless use_cache is False (regenerate)."""
+    if not use_cache:
+        llm_cache.record_bypass()
+        return None
+    return llm_cache.get_cached_response(tailor_cache_key(original_resume, job_description))
+
+async def request_tailored_resume(original_resume: Resume, job_description: JobDescription, use_cache: bool = True) -> Resume:
+    """
+    Tailor the resume with OpenAI, answering repeat job descriptions from the LLM cache.
+    use_cache=False skips the lookup (the new completion still replaces the cached one).
+    Identical requests already in flight (same normalized job description) share
+    one completion. Errors are raised to the caller.
+    """
+    key = f"{tailor_cache_key(original_resume, job_description)}:{int(use_cache)}"
+    return await tailor_flight.do(key, lambda: _request_tailored_resume(original_resume, job_description, use_cache))
+
+async def _request_tailored_resume(original_resume: Resume, job_description: JobDescription, use_cache: bool) -> Resume:
+    content = lookup_cached_completion(original_resume, job_description, use_cache)
+    if content is not None:
+        return parse_tailored_resume(original_resume, content)
+
+    if TAILOR_MODE == "fanout":
+        async for kind, payload in fan_out_tailor_resume(original_resume, job_description):
+            if kind == "resume":
+                return payload
+
+    response = await chat_completion(
+        model=TAILOR_MODEL,
+        messages=build_tailor_messages(original_resume, job_description),
+        response_format={ "type": "json_object" }
+    )
+    content = response.choices[0].message.content
+    tailored_resume = parse_tailored_resume(original_resume, content)
+    return await finish_tailored_resume(original_resume, job_description, tailored_resume)
+
+async def _complete_json(model: str, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+    response = await chat_completion(model=model, messages=messages, response_format={ "type": "json_object" })
+    with span("parse", "json"):
+        return json.loads(response.choices[0].message.content)
+
+async def analyze_job_description(job_description: JobDescription) -> Dict[str, Any]:
+    """
+    Structured analysis of the job description shared by all fan-out sections.
+    Cached by normalized job description, also when regenerating (only the writing is redone).
+    """
+    key = llm_cache.make_cache_key(job_description.description, "", ANALYSIS_PROMPT_VERSION, ANALYSIS_MODEL)
+    cached = llm_cache.get_cached_response(key)
+    if cached is not None:
+        return json.loads(cached)
+    analysis = await _complete_json(ANALYSIS_MODEL, build_analysis_messages(job_description))
+    llm_cache.store_response(key, ANALYSIS_MODEL, json.dumps(analysis))
+    return analysis
+
+async def repair_resume(resume: Resume, job_description: JobDescription,
+                        experience_indexes: Optional[List[int]] = None, check_summary: bool = True) -> Resume:
+    """
+    Validate the resume locally and send small follow-up completions only for
+    a short summary and, per experience entry, the short bullets and any
+    missing ones (extra bullets are dropped locally). Best effort: on errors
+    the resume is returned as it was.
+    """
+    report = validate_resume(resume, experience_indexes, check_summary)
+    if not report["violations"]:
+        return resume
+
+    short: Dict[int, List[int]] = {}
+    counts: Dict[int, int] = {}
+    summary_short = False
+    for violation in report["violations"]:
+        if violation["section"] == "summary":
+            summary_short = True
+        elif violation["rule"] == "bullet_count":
+            counts[violation["index"]] = violation["expected"]
+        else:
+            short.setdefault(violation["index"], []).append(violation["bullet"])
+
+    repaired = resume.model_copy(deep=True)
+    jobs = []
+    if summary_short:
+        async def fix_summary():
+            fixed = await _complete_json(TAILOR_MODEL, build_summary_repair_messages(resume.summary, job_description))
+            repaired.summary = fixed.get("summary") or repaired.summary
+        jobs.append(fix_summary())
+
+    for index in sorted(set(short) | set(counts)):
+        async def fix_experience(index: int = index):
+            experience = repaired.experience[index]
+            bullets = process_bullet_points(experience.description)
+            expected = counts.get(index, len(bullets))
+            # Bullets beyond the expected count are dropped, so only the kept ones need fixing
+            positions = [position for position in short.get(index, []) if position < expected]
+            missing = max(expected - len(bullets), 0)
+            if positions or missing:
+                fixed = await _complete_json(TAILOR_MODEL, build_bullet_repair_messages(
+                    experience, index, bullets, positions, missing, job_description))
+                for position, text in zip(positions, fixed.get("rewritten", [])):
+                    bullets[position] = text
+                bullets.extend(fixed.get("new", [])[:missing])
+            experience.description = " | ".join(bullets[:expected])
+        jobs.append(fix_experience())
+
     try:
-        response = openai.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are an expert resume writer. CRITICAL: Write LONG, DETAILED bullets. Summary: 75+ words. MINIMUM bullet lengths - Senior: 28+ words, Mid: 22+ words, Junior: 16+ words. SHORT BULLETS ARE REJECTED. Each bullet needs: action verb + context + tools/tech + metric + business impact. Example Senior bullet (30 words): 'Architected and deployed high-performance data systems using Kafka and Spark with advanced caching strategies, processing 2M daily transactions while reducing latency by 65% and cutting infrastructure costs by $50K annually'. Output valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            response_format={ "type": "json_object" }
-        )
-        tailored_resume_data = json.loads(response.choices[0].message.content)
-
-        # Ensure fixed fields are truly fixed after OpenAI processing
-        final_resume = Resume(**tailored_resume_data)
-        final_resume.name = original_resume.name
-        final_resume.email = original_resume.email
-        final_resume.phone = original_resume.phone
-        final_resume.linkedin = original_resume.linkedin
-        final_resume.github = original_resume.github
-        final_resume.location = original_resume.location
-
-        # Ensure company, start_date, end_date for experience, and all education fields are fixed
-        if len(original_resume.experience) == len(final_resume.experience):
-            for i in range(len(original_resume.experience)):
-                final_resume.experience[i].company = original_resume.experience[i].company
-                final_resume.experience[i].start_date = original_resume.experience[i].start_date
-                final_resume.experience[i].end_date = original_resume.experience[i].end_date
-        
-        if len(original_resume.education) == len(final_resume.education):
-            for i in range(len(original_resume.education)):
-                final_resume.education[i].degree = original_resume.education[i].degree
-                final_resume.education[i].major = original_resume.education[i].major
-                final_resume.education[i].university = original_resume.education[i].university
-                final_resume.education[i].graduation_date = original_resume.education[i].graduation_date
-
-        return final_resume
+        # Failed repairs show up as stage errors on /metrics
+        with span("repair", "resume"):
+            await asyncio.gather(*jobs)
+    except Exception:
+        return resume
+    return repaired
 
+async def finish_tailored_resume(original_resume: Resume, job_description: JobDescription, tailored_resume: Resume) -> Resume:
+    """Repair (if enabled) a newly generated resume and store it in the LLM cache."""
+    if TAILOR_REPAIR:
+        tailored_resume = await repair_resume(tailored_resume, job_description)
+    llm_cache.store_response(tailor_cache_key(original_resume, job_description), TAILOR_MODEL, tailored_resume.model_dump_json())
+    return tailored_resume
+
+async def fan_out_tailor_resume(original_resume: Resume, job_description: JobDescription) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Tailor with concurrent per-section completions. Yields the same events as
+    stream_tailor_resume as each section finishes, then ("resume", Resume),
+    which is also stored in the LLM cache. Errors are raised to the caller.
+    """
+    analysis = await analyze_job_description(job_description)
+
+    async def overview():
+        return await _complete_json(TAILOR_MODEL, build_overview_messages(original_resume, job_description, analysis))
+
+    async def experience(index: int):
+        return await _complete_json(TAILOR_MODEL, build_experience_messages(original_resume, job_description, analysis, index))
+
+    tasks = {asyncio.create_task(overview()): None}
+    for index in range(len(original_resume.experience)):
+        tasks[asyncio.create_task(experience(index))] = index
+
+    tailored_data = original_resume.model_dump()
+    try:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                section = task.result()
+                index = tasks[task]
+                if index is None:
+                    for name in STREAMED_SECTIONS:
+                        tailored_data[name] = section.get(name, tailored_data[name])
+                        yield "section", {"section": name, "value": tailored_data[name]}
+                else:
+                    entry = tailored_data["experience"][index]
+                    entry.update(title=section.get("title", entry["title"]), description=section.get("description", entry["description"]))
+                    value = enforce_experience_fixed_fields(original_resume, index, Experience(**entry))
+                    yield "experience", {"index": index, "value": value.model_dump()}
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    with span("parse", "resume"):
+        tailored_resume = enforce_fixed_fields(original_resume, tailored_data)
+    yield "resume", await finish_tailored_resume(original_resume, job_description, tailored_resume)
+
+async def regenerate_sections(original_resume: Resume, current_resume: Resume, job_description: JobDescription,
+                              fields: List[str], experience_indexes: List[int]) -> Resume:
+    """
+    Regenerate only the given overview fields (summary, skills, certifications)
+    and experience entries of current_resume, concurrently, sending each
+    completion the job description, its analysis and that section's rules.
+    Everything else is kept as is. Errors are raised to the caller.
+    """
+    analysis = await analyze_job_description(job_description)
+    fields = tuple(field for field in STREAMED_SECTIONS if field in fields)
+
+    jobs = []
+    if fields:
+        jobs.append(_complete_json(TAILOR_MODEL, build_overview_messages(original_resume, job_description, analysis, fields)))
+    for index in experience_indexes:
+        jobs.append(_complete_json(TAILOR_MODEL, build_experience_messages(original_resume, job_description, analysis, index)))
+    sections = await asyncio.gather(*jobs)
+
+    tailored_data = current_resume.model_dump()
+    if fields:
+        overview = sections[0]
+        sections = sections[1:]
+        for name in fields:
+            tailored_data[name] = overview.get(name, tailored_data[name])
+    for index, section in zip(experience_indexes, sections):
+        entry = tailored_data["experience"][index]
+        entry.update(title=section.get("title", entry["title"]), description=section.get("description", entry["description"]))
+    with span("parse", "resume"):
+        updated = enforce_fixed_fields(original_resume, tailored_data)
+    if TAILOR_REPAIR:
+        # Only the regenerated sections are checked; the user kept the rest
+        updated = await repair_resume(updated, job_description, experience_indexes, check_summary="summary" in fields)
+    return updated
+
+async def tailor_resume(original_resume: Resume, job_description: JobDescription, use_cache: bool = True) -> Resume:
+    try:
+        return await request_tailored_resume(original_resume, job_description, use_cache)
     except Exception as e:
         print(f"Error tailoring resume with OpenAI: {e}")
         return original_resume
+
+async def _cached_deltas(content: str) -> AsyncIterator[str]:
+    yield content
+
+async def stream_tailor_resume(original_resume: Resume, job_description: JobDescription, use_cache: bool = True) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Stream the tailored resume section by section. Yields:
+    - ("section", {"section": name, "value": value}) for summary, skills and certifications
+    - ("experience", {"index": i, "value": experience}) for each experience entry
+    - ("resume", Resume) once the whole completion has arrived
+    In fan-out mode events arrive as each section's completion finishes.
+    A cached completion is replayed through the same events at once.
+    Errors are raised to the caller.
+    """
+    cached = lookup_cached_completion(original_resume, job_description, use_cache)
+    if cached is not None:
+        deltas = _cached_deltas(cached)
+    elif TAILOR_MODE == "fanout":
+        async for event in fan_out_tailor_resume(original_resume, job_description):
+            yield event
+        return
+    else:
+        deltas = stream_chat_completion(
+            model=TAILOR_MODEL,
+            messages=build_tailor_messages(original_resume, job_description),
+            response_format={ "type": "json_object" }
+        )
+
+    parser = IncrementalJSONParser()
+    content = []
+    async for delta in deltas:
+        content.append(delta)
+        for event in parser.feed(delta):
+            if event[0] == "item" and event[1] == "experience":
+                _, _, index, value = event
+                experience = enforce_experience_fixed_fields(original_resume, index, Experience(**value))
+                yield "experience", {"index": index, "value": experience.model_dump()}
+            elif event[0] == "field" and event[1] in STREAMED_SECTIONS:
+                yield "section", {"section": event[1], "value": event[2]}
+
+    content = "".join(content)
+    tailored_resume = parse_tailored_resume(original_resume, content)
+    if cached is None:
+        tailored_resume = await finish_tailored_resume(original_resume, job_description, tailored_resume)
+    yield "resume", tailored_resume
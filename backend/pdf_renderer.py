@@ -0,0 +1,153 @@
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+import os
+from .models import Resume
+from .utils import process_bullet_points, split_skill_category
+from .document_generator import (
+    FONT_SIZE_BULLET,
+    FONT_SIZE_SKILLS,
+    FONT_SIZE_SUMMARY,
+    FONT_SIZE_CERTIFICATIONS,
+    FONT_SIZE_JOB_TITLE,
+    FONT_SIZE_DATE,
+    FONT_SIZE_SECTION_HEADER,
+    FONT_SIZE_NAME,
+    FONT_SIZE_CONTACT,
+    BULLET_INDENT,
+    BULLET_HANG,
+)
+
+# =============================================================================
+# PDF LAYOUT CONFIGURATION - Mirrors backend/templates/resume_template.docx
+# =============================================================================
+
+FONTS_DIR = "backend/fonts"
+PDF_FONT_NAME = "DejaVu"
+PDF_FONT_FILE = "DejaVuSansCondensed.ttf"  # Condensed is closest to Calibri's width
+PDF_FONT_FILE_BOLD = "DejaVuSansCondensed-Bold.ttf"
+
+PAGE_MARGIN = 36  # 0.5 inch, in points
+FONT_SIZE_COMPANY = 14  # Company / university lines
+LINE_HEIGHT = 1.25  # Line height as a multiple of font size
+COMPANY_COLOR = (0x2F, 0x54, 0x96)  # Company/university color used in the template
+EXPERIENCE_LOCATION = "Remote"  # Right-aligned on every company line in the template
+
+
+def _line_height(font_size: float) -> float:
+    return font_size * LINE_HEIGHT
+
+
+class ResumePDF(FPDF):
+    """FPDF document preloaded with the bundled DejaVu fonts."""
+
+    def __init__(self):
+        super().__init__(unit="pt", format="letter")
+        self.set_margins(PAGE_MARGIN, PAGE_MARGIN, PAGE_MARGIN)
+        self.set_auto_page_break(True, margin=PAGE_MARGIN)
+        self.add_font(PDF_FONT_NAME, "", os.path.join(FONTS_DIR, PDF_FONT_FILE))
+        self.add_font(PDF_FONT_NAME, "B", os.path.join(FONTS_DIR, PDF_FONT_FILE_BOLD))
+
+    def use_font(self, size, bold=False):
+        self.set_font(PDF_FONT_NAME, "B" if bold else "", size)
+
+    def section_header(self, title):
+        self.ln(6)
+        self.use_font(FONT_SIZE_SECTION_HEADER + 2, bold=True)
+        self.cell(0, _line_height(FONT_SIZE_SECTION_HEADER + 2), title, align="C",
+                  new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        self.ln(2)
+
+    def split_line(self, left, right, left_size, right_size, left_bold=False, left_color=None):
+        """Write one line with text on the left and right margins (the template uses tab stops)."""
+        height = _line_height(max(left_size, right_size))
+        if left_color:
+            self.set_text_color(*left_color)
+        self.use_font(left_size, bold=left_bold)
+        self.cell(self.epw / 2, height, left)
+        self.set_text_color(0, 0, 0)
+        self.use_font(right_size)
+        self.cell(0, height, right, align="R", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    def bullet(self, text, font_size):
+        """Bullet with a hanging indent so wrapped lines align with the first letter."""
+        indent = BULLET_INDENT * 72
+        hang = BULLET_HANG * 72
+        height = _line_height(font_size)
+        self.use_font(font_size)
+        self.set_x(self.l_margin + indent - hang)
+        self.cell(hang, height, "•")
+        self.multi_cell(self.epw - indent, height, text, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    def skills(self, skills, font_size):
+        """Skills with bold category names, same rules as format_skills_with_bold_category."""
+        height = _line_height(font_size)
+        for skill_line in skills:
+            category, skill_list = split_skill_category(skill_line)
+            if category is not None:
+                self.use_font(font_size, bold=True)
+                self.write(height, category + ': ')
+            self.use_font(font_size)
+            self.write(height, skill_list)
+            self.ln(height)
+
+
+def build_pdf(resume: Resume) -> ResumePDF:
+    """Lay out the resume directly as a PDF, reproducing the Word template."""
+    pdf = ResumePDF()
+    pdf.add_page()
+
+    # Name header and contact lines
+    pdf.use_font(FONT_SIZE_NAME, bold=True)
+    pdf.cell(0, _line_height(FONT_SIZE_NAME), resume.name, align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    contact_parts = [part for part in (resume.phone, resume.email) if part]
+    pdf.use_font(FONT_SIZE_CONTACT)
+    pdf.cell(0, _line_height(FONT_SIZE_CONTACT), " • ".join(contact_parts), align="C",
+             new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    links = [link for link in (resume.location, resume.linkedin, resume.github) if link]
+    if links:
+        pdf.cell(0, _line_height(FONT_SIZE_CONTACT), " | ".join(links), align="C",
+                 new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    pdf.section_header("Summary")
+    pdf.use_font(FONT_SIZE_SUMMARY)
+    pdf.multi_cell(0, _line_height(FONT_SIZE_SUMMARY), resume.summary, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    if resume.skills:
+        pdf.section_header("Skills")
+        pdf.skills(resume.skills, FONT_SIZE_SKILLS)
+
+    if resume.experience:
+        pdf.section_header("Professional Experience")
+        for exp in resume.experience:
+            pdf.split_line(exp.company, EXPERIENCE_LOCATION, FONT_SIZE_COMPANY, FONT_SIZE_DATE,
+                           left_bold=True, left_color=COMPANY_COLOR)
+            pdf.split_line(exp.title, f"{exp.start_date}-{exp.end_date or 'Present'}",
+                           FONT_SIZE_JOB_TITLE, FONT_SIZE_DATE, left_bold=True)
+            for point in process_bullet_points(exp.description):
+                pdf.bullet(point, FONT_SIZE_BULLET)
+            pdf.ln(4)
+
+    if resume.education:
+        pdf.section_header("Education")
+        for edu in resume.education:
+            pdf.split_line(edu.university, "", FONT_SIZE_COMPANY, FONT_SIZE_DATE,
+                           left_bold=True, left_color=COMPANY_COLOR)
+            pdf.split_line(f"{edu.degree} in {edu.major}", edu.graduation_date,
+                           FONT_SIZE_DATE, FONT_SIZE_DATE, left_bold=True)
+
+    if resume.projects:
+        pdf.section_header("Projects")
+        for project in resume.projects:
+            pdf.bullet(project, FONT_SIZE_BULLET)
+
+    if resume.certifications:
+        pdf.section_header("Certifications")
+        for cert in resume.certifications:
+            pdf.bullet(cert, FONT_SIZE_CERTIFICATIONS)
+
+    return pdf
+
+
+def render_pdf_resume(resume: Resume) -> bytes:
+    """Render the resume to PDF bytes in memory with fpdf2."""
+    return bytes(build_pdf(resume).output())
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from .models import Resume
+from . import document_generator as dg
+
+# =============================================================================
+# RENDER CACHE CONFIGURATION - Override with environment variables
+# =============================================================================
+
+RENDER_CACHE_DIR = os.environ.get("RENDER_CACHE_DIR", "./tmp/render_cache")
+RENDER_CACHE_MAX_BYTES = int(os.environ.get("RENDER_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))  # 200 MB
+
+# Everything in document_generator that changes how a document looks
+FONT_SETTINGS = (
+    "FONT_NAME", "FONT_SIZE_BULLET", "FONT_SIZE_SKILLS", "FONT_SIZE_SUMMARY",
+    "FONT_SIZE_CERTIFICATIONS", "FONT_SIZE_JOB_TITLE", "FONT_SIZE_DATE",
+    "FONT_SIZE_SECTION_HEADER", "FONT_SIZE_NAME", "FONT_SIZE_CONTACT",
+    "BULLET_INDENT", "BULLET_HANG",
+)
+
+
+class RenderCache:
+    """
+    Size-bounded on-disk store of rendered DOCX/PDF files, keyed by a hash of
+    the resume content and everything else that affects the output. Entries are
+    evicted least-recently-used first (file mtime = last use) once the store
+    exceeds max_bytes. The directory is shared by all worker processes, so its
+    size is measured on disk rather than tracked per process.
+    """
+
+    def __init__(self, directory: str = RENDER_CACHE_DIR, max_bytes: int = RENDER_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._template_fingerprint: Tuple[Optional[Tuple[int, int]], str] = (None, "")
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(self.directory, exist_ok=True)
+        # Files left by a previous run (or other workers) count against max_bytes too
+        self._evict()
+
+    def _scan(self) -> List[Tuple[float, str, int]]:
+        """(mtime, name, size) of every stored entry, least recently used first."""
+        files = []
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".part"):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue  # Evicted by another worker meanwhile
+                    if entry.is_file():
+                        files.append((stat.st_mtime, entry.name, stat.st_size))
+        except FileNotFoundError:
+            pass
+        files.sort()
+        return files
+
+    def _template_hash(self) -> str:
+        """Hash of the template file, recomputed only when its mtime or size changes."""
+        if not os.path.exists(dg.TEMPLATE_PATH):
+            return "no-template"
+        stat = os.stat(dg.TEMPLATE_PATH)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if self._template_fingerprint[0] != stamp:
+            with open(dg.TEMPLATE_PATH, "rb") as f:
+                self._template_fingerprint = (stamp, hashlib.sha256(f.read()).hexdigest())
+        return self._template_fingerprint[1]
+
+    def cache_key(self, resume: Resume, fmt: str) -> str:
+        """Stable hash of resume content, output format, template and font settings."""
+        key_data = {
+            "resume": resume.model_dump(),
+            "format": fmt,
+            "pdf_backend": dg.PDF_BACKEND if fmt == "pdf" else None,
+            "template": self._template_hash(),
+            "fonts": {name: getattr(dg, name) for name in FONT_SETTINGS},
+        }
+        encoded = json.dumps(key_data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def entry_name(self, resume: Resume, fmt: str) -> str:
+        return f"{self.cache_key(resume, fmt)}.{fmt}"
+
+    def contains(self, name: str) -> bool:
+        """Whether the entry is in the store (possibly rendered by another worker), without counting a lookup."""
+        return os.path.exists(os.path.join(self.directory, name))
+
+    def invalidate(self, resume: Resume, formats: Tuple[str, ...] = ("docx", "pdf")):
+        """Drop the renders of this exact resume content, e.g. after it was edited."""
+        for fmt in formats:
+            try:
+                os.remove(os.path.join(self.directory, self.entry_name(resume, fmt)))
+            except FileNotFoundError:
+                pass
+
+    def lookup(self, resume: Resume, fmt: str) -> Tuple[str, Optional[bytes]]:
+        """
+        Return (entry name, cached render) for this resume/format; the render is
+        None on a miss, and the caller renders and passes the result to store().
+        """
+        name = self.entry_name(resume, fmt)
+        path = os.path.join(self.directory, name)
+
+        # The store is shared by all worker processes, so a file this process
+        # has not seen yet (rendered by another worker) is still a hit
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+        except FileNotFoundError:
+            content = None
+
+        if content is None:
+            with self._lock:
+                self.misses += 1
+            return name, None
+
+        with self._lock:
+            self.hits += 1
+        try:
+            os.utime(path)  # Mark as recently used for every worker's eviction
+        except FileNotFoundError:
+            pass
+        return name, content
+
+    def store(self, name: str, content: bytes):
+        """Store a render under the entry name returned by lookup()."""
+        # Write under a private name and rename, so other workers never read a partial file
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=".", suffix=".part", dir=self.directory)
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(temp_path, os.path.join(self.directory, name))
+        self._evict(keep=name)
+
+    def get_or_render(self, resume: Resume, fmt: str, render: Callable[[Resume], bytes]) -> bytes:
+        """Return the cached render for this resume/format, calling render(resume) and storing its output on a miss."""
+        name, content = self.lookup(resume, fmt)
+        if content is None:
+            content = render(resume)
+            self.store(name, content)
+        return content
+
+    def _evict(self, keep: Optional[str] = None):
+        """
+        Drop least-recently-used files until the directory fits in max_bytes.
+        Scans the directory, so files stored by every worker are counted; runs
+        after a render, which costs far more than the scan.
+        """
+        files = self._scan()
+        total = sum(size for _, _, size in files)
+        for _, name, size in files:
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass  # Another worker evicted it first
+            else:
+                with self._lock:
+                    self.evictions += 1
+            total -= size
+
+    def stats(self) -> Dict[str, float]:
+        files = self._scan()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(files),
+                "bytes": sum(size for _, _, size in files),
+                "max_bytes": self.max_bytes,
+            }
+
+
+render_cache = RenderCache()
@@ -0,0 +1,279 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+from .models import Resume
+from . import document_generator as dg
+from .render_cache import render_cache
+from .single_flight import SingleFlight
+from .metrics import Span, absorb_spans, collect_spans, metrics
+
+# =============================================================================
+# RENDER POOL CONFIGURATION - Override with environment variables
+# =============================================================================
+
+# Every uvicorn worker starts its own pool, so by default the cores are split between
+# WEB_CONCURRENCY workers (uvicorn's own setting). Set RENDER_POOL_WORKERS explicitly
+# when the worker count is passed as --workers instead.
+WEB_CONCURRENCY = max(int(os.environ.get("WEB_CONCURRENCY", "1")), 1)
+RENDER_POOL_WORKERS = int(os.environ.get("RENDER_POOL_WORKERS", str(max((os.cpu_count() or 1) // WEB_CONCURRENCY, 1))))  # 0 = render on threads in this process
+RENDER_QUEUE_MAX = int(os.environ.get("RENDER_QUEUE_MAX", "32"))  # Jobs allowed to wait for a busy pool before downloads get a 503
+RENDER_TIMINGS_KEPT = 500  # Recent jobs kept for the timing percentiles
+EAGER_PRERENDER = os.environ.get("EAGER_PRERENDER", "0") == "1"  # Opt-in: render DOCX and PDF as soon as a tailored resume is saved
+RENDER_FORMATS = ("docx", "pdf")
+RENDER_FAILURES_KEPT = 256  # Failed entries remembered for render_status()
+
+
+class RenderQueueFull(Exception):
+    """The render queue is full and the caller asked not to wait."""
+
+
+def _init_worker():
+    """Compile the Word template once per pool process, before its first job."""
+    if os.path.exists(dg.TEMPLATE_PATH):
+        dg.get_compiled_template()
+
+
+def _render_in_worker(fmt: str, resume_data: Dict[str, Any], pdf_backend: str) -> Tuple[bytes, float, float, List[Span]]:
+    """
+    Render one document in a pool process. Returns (content, start time, render
+    seconds, timing spans of the render stages for the parent's metrics).
+    """
+    started = time.time()
+    with collect_spans() as spans:
+        resume = Resume(**resume_data)
+        if fmt == "docx":
+            content = dg.generate_word_resume(resume)
+        else:
+            content = dg.generate_pdf_resume(resume, backend=pdf_backend)
+    return content, started, time.time() - started, spans
+
+
+def _percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class RenderPool:
+    """
+    Runs CPU-bound rendering (python-docx, fpdf2) in a pool of processes so a
+    burst of downloads neither blocks the event loop nor queues on one core.
+    At most workers + queue_max jobs are admitted; beyond that callers either
+    wait for a slot or get RenderQueueFull. Queue wait and render time of each
+    job are recorded for stats().
+    """
+
+    def __init__(self, workers: int = RENDER_POOL_WORKERS, queue_max: int = RENDER_QUEUE_MAX):
+        self.workers = workers
+        self.queue_max = queue_max
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._slots = asyncio.Semaphore(max(workers, 1) + queue_max)
+        self._timings: deque = deque(maxlen=RENDER_TIMINGS_KEPT)  # (kind, wait, render, total) in seconds
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: never fork a process that runs threads and holds SQLite connections
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            return self._executor
+
+    def _admit(self, wait: bool):
+        if not wait and self._slots.locked():
+            self.rejected += 1
+            raise RenderQueueFull(f"Render queue is full ({self.queue_max} waiting)")
+
+    async def render(self, fmt: str, resume: Resume, wait: bool = False) -> bytes:
+        """Render resume as "docx" or "pdf" (with dg.PDF_BACKEND) off the event loop."""
+        self._admit(wait)
+        async with self._slots:
+            self.pending += 1
+            submitted = time.time()
+            args = (fmt, resume.model_dump(), dg.PDF_BACKEND)
+            try:
+                if self.workers > 0:
+                    executor = self._get_executor()
+                    content, started, render_seconds, spans = await asyncio.get_running_loop().run_in_executor(
+                        executor, _render_in_worker, *args
+                    )
+                else:
+                    content, started, render_seconds, spans = await asyncio.to_thread(_render_in_worker, *args)
+            except BrokenProcessPool:
+                # A pool process died (e.g. out of memory); start a fresh pool for the next job
+                self.failed += 1
+                with self._lock:
+                    if self._executor is executor:
+                        self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            except Exception:
+                self.failed += 1
+                raise
+            finally:
+                self.pending -= 1
+
+        # Spans of a render on a thread were already observed in this process
+        absorb_spans(spans, observe=self.workers > 0)
+        self.record(fmt, started - submitted, render_seconds, time.time() - submitted)
+        return content
+
+    async def convert_to_pdf(self, docx: bytes, wait: bool = False) -> bytes:
+        """
+        Convert a rendered .docx to PDF with LibreOffice / Word on a thread. The
+        conversion takes a slot like a render, so it is bounded by the same queue.
+        """
+        self._admit(wait)
+        async with self._slots:
+            self.pending += 1
+            submitted = time.time()
+            try:
+                content, started = await asyncio.to_thread(self._convert_on_thread, docx)
+            except Exception:
+                self.failed += 1
+                raise
+            finally:
+                self.pending -= 1
+
+        finished = time.time()
+        self.record("pdf_convert", started - submitted, finished - started, finished - submitted)
+        return content
+
+    @staticmethod
+    def _convert_on_thread(docx: bytes) -> Tuple[bytes, float]:
+        started = time.time()
+        return dg.convert_docx_to_pdf(docx), started
+
+    def record(self, kind: str, wait: float, render: float, total: float):
+        self.completed += 1
+        self._timings.append((kind, max(wait, 0.0), render, total))
+        metrics.observe("render_queue", kind, max(wait, 0.0))
+        metrics.observe("render", kind, render)
+
+    def stats(self) -> Dict[str, Any]:
+        timings: Dict[str, Dict[str, float]] = {}
+        for kind in sorted({entry[0] for entry in self._timings}):
+            entries = [entry for entry in self._timings if entry[0] == kind]
+            timings[kind] = {"jobs": len(entries)}
+            for i, metric in enumerate(("wait", "render", "total"), start=1):
+                values = [entry[i] * 1000 for entry in entries]
+                timings[kind][f"{metric}_ms_mean"] = round(sum(values) / len(values), 1)
+                timings[kind][f"{metric}_ms_p50"] = round(_percentile(values, 0.5), 1)
+                timings[kind][f"{metric}_ms_p95"] = round(_percentile(values, 0.95), 1)
+        return {
+            "workers": self.workers,
+            "queue_max": self.queue_max,
+            "pending": self.pending,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "timings": timings,
+        }
+
+    def shutdown(self):
+        """Cancel queued jobs, let running ones finish and stop the pool processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+render_pool = RenderPool()
+
+
+# Renders running in this process, by render cache entry name (resume hash + format)
+render_flight = SingleFlight()
+# Last error of entries whose most recent render failed
+_failures: "OrderedDict[str, str]" = OrderedDict()
+
+
+def _start_render(resume: Resume, fmt: str, wait: bool) -> "asyncio.Future[bytes]":
+    """Future for the rendered document: cached, already rendering in this process, or newly started."""
+    name, content = render_cache.lookup(resume, fmt)
+    if content is not None:
+        cached = asyncio.get_running_loop().create_future()
+        cached.set_result(content)
+        return cached
+
+    return render_flight.start(name, lambda: _render_and_store(name, resume, fmt, wait))
+
+
+async def render_document(resume: Resume, fmt: str, wait: bool = False) -> bytes:
+    """
+    Return the rendered document from the render cache, rendering it in the
+    pool on a miss. A render of the same entry already running in this
+    process (e.g. a pre-render) is awaited instead of starting a second one.
+    wait=False raises RenderQueueFull instead of queueing behind a full pool.
+    """
+    # A caller that goes away (client disconnect) must not cancel the render for the others
+    return await asyncio.shield(_start_render(resume, fmt, wait))
+
+
+async def _render_and_store(name: str, resume: Resume, fmt: str, wait: bool) -> bytes:
+    try:
+        if fmt == "pdf" and dg.PDF_BACKEND == "office":
+            # The .docx is rendered (or reused) in the pool and converted on a thread,
+            # since LibreOffice / Word run in their own processes anyway
+            docx = await render_document(resume, "docx", wait)
+            content = await render_pool.convert_to_pdf(docx, wait)
+        else:
+            content = await render_pool.render(fmt, resume, wait)
+    except RenderQueueFull:
+        raise
+    except Exception as e:
+        _failures[name] = str(e)
+        while len(_failures) > RENDER_FAILURES_KEPT:
+            _failures.popitem(last=False)
+        raise
+    _failures.pop(name, None)
+    render_cache.store(name, content)
+    return content
+
+
+async def prerender(resume: Resume) -> List[str]:
+    """Render every download format into the render cache. Returns the formats rendered."""
+    # Background work waits for room in the render queue instead of being rejected
+    await asyncio.gather(*(render_document(resume, fmt, wait=True) for fmt in RENDER_FORMATS))
+    return list(RENDER_FORMATS)
+
+
+def schedule_prerender(resume: Resume):
+    """
+    Start rendering every format in the background. The renders are registered
+    immediately, so render_status() reports them and downloads join them.
+    """
+    for fmt in RENDER_FORMATS:
+        _start_render(resume, fmt, wait=True).add_done_callback(_report_prerender)
+
+
+def _report_prerender(job: "asyncio.Future[bytes]"):
+    if not job.cancelled() and job.exception() is not None:
+        print(f"Pre-render failed: {job.exception()}")
+
+
+def render_status(resume: Resume) -> Dict[str, Dict[str, Optional[str]]]:
+    """Per format: "ready", "rendering", "failed" (with the error) or "not_started"."""
+    status = {}
+    for fmt in RENDER_FORMATS:
+        name = render_cache.entry_name(resume, fmt)
+        if render_cache.contains(name):
+            status[fmt] = {"status": "ready", "error": None}
+        elif render_flight.in_flight(name):
+            status[fmt] = {"status": "rendering", "error": None}
+        elif name in _failures:
+            status[fmt] = {"status": "failed", "error": _failures[name]}
+        else:
+            status[fmt] = {"status": "not_started", "error": None}
+    return status
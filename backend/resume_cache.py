@@ -0,0 +1,137 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from .models import Resume
+from .resume_state import ResumeStateBackend, create_resume_state
+
+# =============================================================================
+# RESUME CACHE CONFIGURATION - Override with environment variables
+# =============================================================================
+
+RESUME_CACHE_MAX_ENTRIES = int(os.environ.get("RESUME_CACHE_MAX_ENTRIES", "256"))
+RESUME_CACHE_MAX_BYTES = int(os.environ.get("RESUME_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))  # 16 MB
+
+
+class ResumeCache:
+    """
+    Size-bounded, per-process LRU cache of Resume objects in front of the
+    shared resume state backend (the resumes table by default). Bounded by
+    entry count and by approximate size (length of the resume JSON). A miss
+    falls through to the backend, so any stored resume_id can be served, from
+    any worker, including ones generated before a restart. A hit is checked
+    against the backend's version of the resume, so a resume deleted or
+    regenerated by another worker is dropped or reloaded instead of served stale.
+    """
+
+    def __init__(self, backend: ResumeStateBackend, max_entries: int = RESUME_CACHE_MAX_ENTRIES,
+                 max_bytes: int = RESUME_CACHE_MAX_BYTES):
+        self.backend = backend
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Resume, int, str]]" = OrderedDict()  # resume, size, version
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_found = 0
+        self.stale = 0
+        self.evictions = 0
+
+    def get(self, resume_id: str) -> Optional[Resume]:
+        """Return the resume from memory, loading it from the backend on a miss. None if it doesn't exist."""
+        with self._lock:
+            entry = self._entries.get(resume_id)
+
+        if entry is not None:
+            # Other workers may have deleted or regenerated it; a primary key lookup, no JSON to inflate or parse
+            version = self.backend.version(resume_id)
+            if version is None:
+                self.discard(resume_id)
+                with self._lock:
+                    self.not_found += 1
+                return None
+            if version == entry[2]:
+                with self._lock:
+                    if resume_id in self._entries:
+                        self._entries.move_to_end(resume_id)
+                    self.hits += 1
+                return entry[0]
+            with self._lock:
+                self.stale += 1
+
+        with self._lock:
+            self.misses += 1
+        loaded = self.backend.load(resume_id)
+        if loaded is None:
+            self.discard(resume_id)
+            with self._lock:
+                self.not_found += 1
+            return None
+        resume, version = loaded
+        self.put(resume_id, resume, version)
+        return resume
+
+    def put(self, resume_id: str, resume: Resume, version: str):
+        """Cache a resume that is already stored in the backend, with the backend's version of it."""
+        size = len(resume.model_dump_json())
+        with self._lock:
+            old = self._entries.pop(resume_id, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[resume_id] = (resume, size, version)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def save(self, resume_id: str, job_title: str, job_description: str, resume: Resume, job_link: str = None):
+        """Write-through: store the resume in the shared backend, then cache it."""
+        version = self.backend.store(resume_id, job_title, job_description, resume, job_link)
+        self.put(resume_id, resume, version)
+
+    def save_many(self, rows: List[Dict[str, Any]]):
+        """Write-through for several resumes in one backend transaction. Rows have the arguments of save()."""
+        versions = self.backend.store_many(rows)
+        for row, version in zip(rows, versions):
+            self.put(row["resume_id"], row["resume"], version)
+
+    def update(self, resume_id: str, resume: Resume) -> bool:
+        """Write-through replacement of a stored resume's content. Returns False if it doesn't exist."""
+        version = self.backend.update(resume_id, resume)
+        if version is None:
+            self.discard(resume_id)
+            return False
+        self.put(resume_id, resume, version)
+        return True
+
+    def delete(self, resume_id: str) -> bool:
+        """Delete the resume from the backend and from this process's cache."""
+        self.discard(resume_id)
+        return self.backend.delete(resume_id)
+
+    def discard(self, resume_id: str):
+        with self._lock:
+            entry = self._entries.pop(resume_id, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_found": self.not_found,
+                "stale": self.stale,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "approx_bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+resume_cache = ResumeCache(create_resume_state())
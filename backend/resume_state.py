@@ -0,0 +1,108 @@
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+from .models import Resume
+from . import database as db
+
+# =============================================================================
+# RESUME STATE CONFIGURATION - Override with environment variables
+# =============================================================================
+
+# Must be visible to every uvicorn worker (see RESUME_STATE_BACKENDS below).
+# "sqlite" - the resumes table, shared by all workers on the host (default)
+RESUME_STATE_BACKEND = os.environ.get("RESUME_STATE_BACKEND", "sqlite")
+
+
+class ResumeStateBackend(ABC):
+    """
+    Where generated resumes live between generation, download and chat.
+    Implementations must be shared across worker processes; each process
+    keeps its own ResumeCache in front of it.
+    """
+
+    @abstractmethod
+    def load(self, resume_id: str) -> Optional[Tuple[Resume, str]]:
+        """The stored resume and its version(), or None if it doesn't exist."""
+
+    @abstractmethod
+    def version(self, resume_id: str) -> Optional[str]:
+        """Cheap check of a stored resume: a version that changes with its content, or None if it doesn't exist."""
+
+    @abstractmethod
+    def store(self, resume_id: str, job_title: str, job_description: str, resume: Resume, job_link: str = None) -> str:
+        """Store a resume. Returns its version."""
+
+    @abstractmethod
+    def store_many(self, rows: List[Dict[str, Any]]) -> List[str]:
+        """Store several resumes atomically. Rows have the keyword arguments of store(). Returns their versions."""
+
+    @abstractmethod
+    def update(self, resume_id: str, resume: Resume) -> Optional[str]:
+        """Replace the content of a stored resume. Returns its new version, or None if it doesn't exist."""
+
+    @abstractmethod
+    def delete(self, resume_id: str) -> bool:
+        ...
+
+
+class SQLiteResumeState(ResumeStateBackend):
+    """
+    Resumes stored in the history table. Every worker process opens the same
+    WAL-mode database (memory-mapped, see DB_MMAP_SIZE), so a resume generated
+    on one worker can be downloaded or chatted about on any other.
+    """
+
+    def load(self, resume_id: str) -> Optional[Tuple[Resume, str]]:
+        stored = db.get_resume(resume_id)
+        if not stored:
+            return None
+        return Resume(**stored["resume_data"]), db.resume_data_version(stored["resume_data"])
+
+    def version(self, resume_id: str) -> Optional[str]:
+        return db.get_resume_version(resume_id)
+
+    def store(self, resume_id: str, job_title: str, job_description: str, resume: Resume, job_link: str = None) -> str:
+        resume_data = resume.model_dump()
+        db.save_resume(
+            resume_id=resume_id,
+            job_title=job_title,
+            job_description=job_description,
+            resume_data=resume_data,
+            job_link=job_link
+        )
+        return db.resume_data_version(resume_data)
+
+    def store_many(self, rows: List[Dict[str, Any]]) -> List[str]:
+        stored = [
+            {
+                "resume_id": row["resume_id"],
+                "job_title": row["job_title"],
+                "job_description": row["job_description"],
+                "job_link": row.get("job_link"),
+                "resume_data": row["resume"].model_dump(),
+            }
+            for row in rows
+        ]
+        db.save_resumes(stored)
+        return [db.resume_data_version(row["resume_data"]) for row in stored]
+
+    def update(self, resume_id: str, resume: Resume) -> Optional[str]:
+        resume_data = resume.model_dump()
+        if not db.update_resume_data(resume_id, resume_data):
+            return None
+        return db.resume_data_version(resume_data)
+
+    def delete(self, resume_id: str) -> bool:
+        return db.delete_resume(resume_id)
+
+
+# Backends selectable with RESUME_STATE_BACKEND; anything shared by all workers can be added here
+RESUME_STATE_BACKENDS = {
+    "sqlite": SQLiteResumeState,
+}
+
+
+def create_resume_state(name: str = RESUME_STATE_BACKEND) -> ResumeStateBackend:
+    if name not in RESUME_STATE_BACKENDS:
+        raise ValueError(f"Unknown resume state backend: {name}")
+    return RESUME_STATE_BACKENDS[name]()
@@ -0,0 +1,71 @@
+from typing import Any, Dict, List, Optional, Tuple
+from .models import Resume
+from .utils import process_bullet_points
+
+# =============================================================================
+# RESUME RULES - The word and bullet counts the tailoring prompts ask for
+# =============================================================================
+
+SUMMARY_MIN_WORDS = 75
+
+# Title level, bullet count and minimum words per bullet, by position in the template's experience list
+EXPERIENCE_LEVELS = (
+    ("Senior", 10, 28),  # WebKorps
+    ("Mid", 8, 22),  # IBM
+    ("Junior", 6, 16),  # AmericanKorps
+)
+
+
+def experience_level(index: int) -> Tuple[str, int, int]:
+    """(level, bullet count, minimum words per bullet) of the experience entry at index."""
+    return EXPERIENCE_LEVELS[min(index, len(EXPERIENCE_LEVELS) - 1)]
+
+
+def count_words(text: str) -> int:
+    return len(text.split())
+
+
+def validate_resume(resume: Resume, experience_indexes: Optional[List[int]] = None,
+                    check_summary: bool = True) -> Dict[str, Any]:
+    """
+    Score the resume against the length rules without calling the model.
+    Returns {"score": passed checks / all checks, "violations": [...]}, where each
+    violation is one of
+    - {"section": "summary", "rule": "min_words", "expected": 75, "actual": n}
+    - {"section": "experience", "index": i, "rule": "bullet_count", "expected": n, "actual": m}
+    - {"section": "experience", "index": i, "bullet": j, "rule": "min_words", "expected": n, "actual": m}
+    Only the given experience entries (default all) and optionally the summary are checked.
+    """
+    checks = 0
+    violations = []
+
+    if check_summary:
+        checks += 1
+        words = count_words(resume.summary)
+        if words < SUMMARY_MIN_WORDS:
+            violations.append({"section": "summary", "rule": "min_words", "expected": SUMMARY_MIN_WORDS, "actual": words})
+
+    if experience_indexes is None:
+        experience_indexes = range(len(resume.experience))
+    for index in experience_indexes:
+        _, bullet_count, min_words = experience_level(index)
+        bullets = process_bullet_points(resume.experience[index].description)
+        checks += 1
+        if len(bullets) != bullet_count:
+            violations.append({
+                "section": "experience", "index": index, "rule": "bullet_count",
+                "expected": bullet_count, "actual": len(bullets),
+            })
+        for position, bullet in enumerate(bullets):
+            checks += 1
+            words = count_words(bullet)
+            if words < min_words:
+                violations.append({
+                    "section": "experience", "index": index, "bullet": position, "rule": "min_words",
+                    "expected": min_words, "actual": words,
+                })
+
+    return {
+        "score": (checks - len(violations)) / checks if checks else 1.0,
+        "violations": violations,
+    }
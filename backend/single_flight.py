@@ -0,0 +1,43 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller starts the
+    work, callers arriving while it runs await the same result (or exception)
+    instead of repeating it. Keys are forgotten as soon as the work finishes,
+    so this deduplicates in-flight work only; caching is left to the caller.
+    Per process, like the rest of the in-memory state.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, "asyncio.Future[Any]"] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    def start(self, key: str, work: Callable[[], Awaitable[Any]]) -> "asyncio.Future[Any]":
+        """Future for the call with this key, starting work() unless one is already running."""
+        call = self._calls.get(key)
+        if call is not None:
+            self.coalesced += 1
+            return call
+        self.started += 1
+        call = asyncio.ensure_future(work())
+        self._calls[key] = call
+        call.add_done_callback(lambda _: self._calls.pop(key, None))
+        return call
+
+    async def do(self, key: str, work: Callable[[], Awaitable[Any]]) -> Any:
+        # A caller that goes away (e.g. client disconnect) must not cancel the work for the others
+        return await asyncio.shield(self.start(key, work))
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._calls
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._calls),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
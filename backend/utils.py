@@ -1,4 +1,5 @@
-from typing import List
+from typing import Any, List, Optional, Tuple
+import json
 import re
 
 def process_bullet_points(text: str) -> List[str]:
@@ -45,3 +46,19 @@ def process_bullet_points(text: str) -> List[str]:
     
     return processed_lines if processed_lines else [text]
 
+
+
+def split_skill_category(skill_line: str) -> Tuple[Optional[str], str]:
+    """
+    Split a skill line of the form "Category Name: skill1, skill2" into
+    (category, skills). Returns (None, skill_line) when there is no category.
+    """
+    if ':' in skill_line:
+        category, skill_list = skill_line.split(':', 1)
+        return category.strip(), skill_list.strip()
+    return None, skill_line
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Format one Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
@@ -24,7 +24,7 @@ function ChatBox({ resumeId }) {
   const loadChatHistory = async () => {
     try {
       const response = await axios.get(`http://localhost:8000/chat/${resumeId}`);
-      setMessages(response.data);
+      setMessages(response.data.items);
     } catch (error) {
       console.error('Error loading chat history:', error);
     }
@@ -38,23 +38,48 @@ function ChatBox({ resumeId }) {
     setInput('');
     setLoading(true);
 
-    // Optimistically add user message
-    setMessages(prev => [...prev, { role: 'user', content: userMessage }]);
+    // Optimistically add user message, plus the assistant message filled in as tokens arrive
+    setMessages(prev => [...prev, { role: 'user', content: userMessage }, { role: 'assistant', content: '' }]);
+    const updateAnswer = (update) => {
+      setMessages(prev => [...prev.slice(0, -1), update(prev[prev.length - 1])]);
+    };
 
     try {
-      const response = await axios.post('http://localhost:8000/chat/', {
-        resume_id: resumeId,
-        message: userMessage
+      const response = await fetch('http://localhost:8000/chat/stream', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ resume_id: resumeId, message: userMessage })
       });
-      
-      // Update with full history from server
-      setMessages(response.data.chat_history);
+      if (!response.ok) throw new Error(`Chat request failed: ${response.status}`);
+
+      // Server-Sent Events: "token" deltas, then "done" with the saved message, or "error"
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      for (;;) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+        for (const raw of events) {
+          const event = raw.match(/^event: (.*)$/m)?.[1];
+          const data = JSON.parse(raw.match(/^data: (.*)$/m)?.[1] || '{}');
+          if (event === 'token') {
+            updateAnswer(msg => ({ ...msg, content: msg.content + data.content }));
+          } else if (event === 'done') {
+            updateAnswer(() => data.message);
+          } else if (event === 'error') {
+            throw new Error(data.detail);
+          }
+        }
+      }
     } catch (error) {
       console.error('Chat error:', error);
-      setMessages(prev => [...prev, { 
+      updateAnswer(() => ({ 
         role: 'assistant', 
         content: 'Sorry, I encountered an error. Please try again.' 
-      }]);
+      }));
     } finally {
       setLoading(false);
     }
@@ -94,13 +119,13 @@ function ChatBox({ resumeId }) {
             <p className="suggestions">Try: "How can I improve my summary?" or "What skills should I highlight?"</p>
           </div>
         )}
-        {messages.map((msg, idx) => (
+        {messages.filter(msg => msg.content).map((msg, idx) => (
           <div key={idx} className={`chat-message ${msg.role}`}>
             <span className="message-role">{msg.role === 'user' ? 'You' : 'AI'}:</span>
             <span className="message-content">{msg.content}</span>
           </div>
         ))}
-        {loading && (
+        {loading && !messages[messages.length - 1]?.content && (
           <div className="chat-message assistant loading">
             <span className="message-role">AI:</span>
             <span className="message-content">Thinking...</span>
@@ -1,11 +1,15 @@
 import React, { useState, useEffect } from 'react';
 import axios from 'axios';
 
+const PREVIEW_CHARS = 1000; // Job description characters shown when an entry is expanded
+
 function HistoryPage({ onSelectResume, onBack }) {
   const [history, setHistory] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [expandedId, setExpandedId] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     loadHistory();
@@ -14,8 +18,11 @@ function HistoryPage({ onSelectResume, onBack }) {
   const loadHistory = async () => {
     setLoading(true);
     try {
-      const response = await axios.get('http://localhost:8000/history/');
-      setHistory(response.data);
+      const response = await axios.get('http://localhost:8000/history/', {
+        params: { preview_chars: PREVIEW_CHARS }
+      });
+      setHistory(response.data.items);
+      setNextCursor(response.data.next_cursor);
       setError(null);
     } catch (err) {
       setError('Failed to load history');
@@ -25,6 +32,22 @@ function HistoryPage({ onSelectResume, onBack }) {
     }
   };
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const response = await axios.get('http://localhost:8000/history/', {
+        params: { cursor: nextCursor, preview_chars: PREVIEW_CHARS }
+      });
+      setHistory(prev => [...prev, ...response.data.items]);
+      setNextCursor(response.data.next_cursor);
+    } catch (err) {
+      alert('Error loading more history');
+      console.error('Error loading more history:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleSelect = async (resumeId) => {
     try {
       const response = await axios.get(`http://localhost:8000/history/${resumeId}`);
@@ -109,7 +132,7 @@ function HistoryPage({ onSelectResume, onBack }) {
                 <p className="history-date">{formatDate(item.created_at)}</p>
               </div>
               <div className="history-item-actions">
-                {item.job_description && (
+                {item.job_description_preview && (
                   <button 
                     onClick={(e) => toggleExpand(item.id, e)}
                     className="expand-btn"
@@ -126,15 +149,24 @@ function HistoryPage({ onSelectResume, onBack }) {
                 </button>
               </div>
             </div>
-            {expandedId === item.id && item.job_description && (
+            {expandedId === item.id && item.job_description_preview && (
               <div className="history-item-description" onClick={(e) => e.stopPropagation()}>
                 <h4>Job Description:</h4>
-                <pre>{item.job_description}</pre>
+                <pre>
+                  {item.job_description_preview}
+                  {item.job_description_preview.length >= PREVIEW_CHARS && '…'}
+                </pre>
               </div>
             )}
           </div>
         ))}
       </div>
+
+      {nextCursor && (
+        <button onClick={loadMore} disabled={loadingMore} className="load-more-btn">
+          {loadingMore ? 'Loading...' : 'Load more'}
+        </button>
+      )}
     </div>
   );
 }